@@ -0,0 +1,124 @@
+"""Скользящие суммы тренировок по пользователям.
+
+Окно делится на корзины фиксированной ширины. Обновление добавляет
+значения в корзину своего времени и очищает устаревшие корзины, число
+которых ограничено размером окна, поэтому стоимость обновления не
+зависит от количества тренировок.
+"""
+from array import array
+
+from homework import InfoMessage
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Окно: (ширина корзины в секундах, количество корзин).
+WINDOWS = {
+    'day': (HOUR, 24),
+    'week': (DAY, 7),
+    'month': (DAY, 30),
+}
+
+METRICS = ('count', 'duration', 'distance', 'calories')
+
+
+class RollingWindow:
+    """Кольцо корзин одного окна для одного пользователя."""
+    __slots__ = ('width', 'size', 'head', 'values')
+
+    def __init__(self, width: int, size: int) -> None:
+        self.width = width
+        self.size = size
+        self.head = None
+        self.values = array('d', bytes(8 * len(METRICS) * size))
+
+    def advance(self, bucket: int) -> None:
+        """Сдвинуть окно до корзины `bucket`, очистив устаревшие."""
+        if self.head is None or bucket - self.head >= self.size:
+            self.values = array('d', bytes(8 * len(self.values)))
+        else:
+            width = len(METRICS)
+            for stale in range(self.head + 1, bucket + 1):
+                start = stale % self.size * width
+                self.values[start:start + width] = array('d', [0.0] * width)
+        self.head = bucket
+
+    def add(self, timestamp: float, values) -> None:
+        """Добавить значения тренировки со временем `timestamp`."""
+        bucket = int(timestamp // self.width)
+        if self.head is None or bucket > self.head:
+            self.advance(bucket)
+        elif bucket <= self.head - self.size:
+            return
+        start = bucket % self.size * len(METRICS)
+        for offset, value in enumerate(values):
+            self.values[start + offset] += value
+
+    def totals(self, now: float = None) -> dict:
+        """Суммы по окну на момент `now` или последнего обновления."""
+        if now is not None:
+            bucket = int(now // self.width)
+            if self.head is None or bucket > self.head:
+                self.advance(bucket)
+        width = len(METRICS)
+        return {
+            name: sum(self.values[offset::width])
+            for offset, name in enumerate(METRICS)
+        }
+
+
+class RollingAggregator:
+    """Скользящие суммы по окнам `windows` для каждого пользователя."""
+
+    def __init__(self, windows: dict = WINDOWS) -> None:
+        self.windows = dict(windows)
+        self.users = {}
+
+    def add(self, user, timestamp: float, info: InfoMessage) -> None:
+        """Учесть результат тренировки пользователя."""
+        user_windows = self.users.get(user)
+        if user_windows is None:
+            user_windows = self.users[user] = {
+                name: RollingWindow(width, size)
+                for name, (width, size) in self.windows.items()
+            }
+        values = (1, info.duration, info.distance, info.calories)
+        for window in user_windows.values():
+            window.add(timestamp, values)
+
+    def totals(self, user, window: str, now: float = None) -> dict:
+        """Суммы пользователя по окну `window`."""
+        user_windows = self.users.get(user)
+        if user_windows is None:
+            return dict.fromkeys(METRICS, 0.0)
+        return user_windows[window].totals(now)
+
+    def snapshot(self) -> dict:
+        """Состояние агрегатора из простых типов для сохранения."""
+        return {
+            'windows': {
+                name: list(window) for name, window in self.windows.items()
+            },
+            'users': {
+                user: {
+                    name: [window.head, list(window.values)]
+                    for name, window in user_windows.items()
+                }
+                for user, user_windows in self.users.items()
+            },
+        }
+
+    @classmethod
+    def restore(cls, state: dict) -> 'RollingAggregator':
+        """Восстановить агрегатор из результата `snapshot`."""
+        aggregator = cls({
+            name: tuple(window) for name, window in state['windows'].items()
+        })
+        for user, user_windows in state['users'].items():
+            aggregator.users[user] = {}
+            for name, (head, values) in user_windows.items():
+                window = RollingWindow(*aggregator.windows[name])
+                window.head = head
+                window.values = array('d', values)
+                aggregator.users[user][name] = window
+        return aggregator
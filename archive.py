@@ -0,0 +1,113 @@
+"""Архив тренировок на диске с доступом через mmap.
+
+Файл архива - сигнатура `MAGIC` и один кадр формата `wire`:
+заголовок с кодом тренировки и количеством записей и записи
+фиксированной ширины. Чтение отображает файл в память только
+на чтение, поэтому срезы загружают лишь нужные страницы,
+а процессы, открывшие один архив, делят эти страницы.
+"""
+import mmap
+import os
+
+from batch import BatchResult, TrainingBatch
+from homework import Training, get_spec
+from wire import FRAME_HEADER, encode_frame, frame_values
+
+MAGIC = b'WKARCH1\0'
+HEADER_SIZE = len(MAGIC) + FRAME_HEADER.size
+
+
+def write_archive(path, workout_type: str, rows) -> None:
+    """Создать архив тренировок одного типа."""
+    with open(path, 'wb') as file:
+        file.write(MAGIC + encode_frame(workout_type, rows))
+
+
+def append_archive(path, rows) -> int:
+    """Дописать записи в архив и вернуть новое количество записей."""
+    with open(path, 'r+b') as file:
+        workout_type, count = read_header(file.read(HEADER_SIZE))
+        frame = encode_frame(workout_type, rows)
+        added = FRAME_HEADER.unpack_from(frame)[1]
+        file.seek(0, os.SEEK_END)
+        file.write(frame[FRAME_HEADER.size:])
+        file.seek(len(MAGIC))
+        file.write(
+            FRAME_HEADER.pack(workout_type.encode('ascii'), count + added)
+        )
+    return count + added
+
+
+def read_header(header: bytes) -> tuple[str, int]:
+    """Прочитать код тренировки и количество записей архива."""
+    if header[:len(MAGIC)] != MAGIC or len(header) < HEADER_SIZE:
+        raise ValueError('Файл не является архивом тренировок')
+    code, count = FRAME_HEADER.unpack_from(header, len(MAGIC))
+    return code.decode('ascii'), count
+
+
+class WorkoutArchive:
+    """Архив тренировок, открытый только для чтения."""
+
+    def __init__(self, path) -> None:
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        try:
+            self.workout_type, self._count = read_header(
+                self._mmap[:HEADER_SIZE]
+            )
+            self.spec = get_spec(self.workout_type)
+            self._values = frame_values(
+                self._mmap,
+                HEADER_SIZE,
+                self.workout_type,
+                self._count * self.spec.arity * 8
+            )
+        except (TypeError, ValueError):
+            self._mmap.close()
+            raise
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> Training:
+        """Создать объект тренировки для записи `index`."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('Номер записи вне архива')
+        arity = self.spec.arity
+        return self.spec.training_class(
+            *self._values[index * arity:(index + 1) * arity]
+        )
+
+    def batch(self, start: int = 0, stop: int = None) -> TrainingBatch:
+        """Колонки записей `[start, stop)` без копирования данных."""
+        start, stop, _ = slice(start, stop).indices(self._count)
+        arity = self.spec.arity
+        values = self._values[start * arity:max(start, stop) * arity]
+        return TrainingBatch(self.workout_type, {
+            name: values[index::arity]
+            for index, name in enumerate(self.spec.field_names)
+        })
+
+    def compute(self, start: int = 0, stop: int = None) -> BatchResult:
+        """Рассчитать тренировки из записей `[start, stop)`."""
+        return self.batch(start, stop).compute()
+
+    def close(self) -> None:
+        """Закрыть архив.
+
+        Колонки, полученные из `batch`, к этому моменту должны быть
+        удалены, иначе отображение закрыть нельзя.
+        """
+        self._values.release()
+        self._mmap.close()
+
+    def __enter__(self) -> 'WorkoutArchive':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
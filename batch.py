@@ -0,0 +1,371 @@
+"""Пакетный расчёт тренировок по колонкам данных."""
+import os
+import sys
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from itertools import compress, repeat
+from operator import not_
+
+from homework import InfoMessage, get_spec, iter_chunks, wrong_len_error
+
+CHUNK_SIZE = 10_000
+
+ERROR_RANGE_MESSAGE = (
+    'Пакет {index}: значение {name} вне допустимого диапазона'
+)
+
+
+@dataclass
+class BatchResult:
+    """Результаты пакетного расчёта тренировок одного типа."""
+    training_type: str
+    duration: array
+    distance: array
+    speed: array
+    calories: array
+
+    def __len__(self) -> int:
+        return len(self.duration)
+
+    def iter_info(self):
+        """Вернуть информационные сообщения по каждой тренировке."""
+        training_type = self.training_type
+        for duration, distance, speed, calories in zip(
+            self.duration, self.distance, self.speed, self.calories
+        ):
+            yield InfoMessage(
+                training_type, duration, distance, speed, calories
+            )
+
+
+def compute_batch(workout_type: str, columns) -> BatchResult:
+    """Рассчитать тренировки одного типа по колонкам данных.
+
+    `columns` - словарь {имя поля: последовательность значений}
+    с полями класса тренировки из `CLASSES`.
+    """
+    spec = get_spec(workout_type)
+    training_class = spec.training_class
+    names = spec.field_names
+    missing = [name for name in names if name not in columns]
+    if missing:
+        raise KeyError(
+            f'Не переданы колонки {", ".join(missing)} '
+            f'для типа тренировки {workout_type}'
+        )
+    duration = array('d', columns['duration'])
+    data = [
+        duration if name == 'duration' else columns[name]
+        for name in names
+    ]
+    if any(len(column) != len(duration) for column in data):
+        raise ValueError('Колонки должны быть одинаковой длины')
+    distance, speed, calories = spec.batch_kernel(*data)
+    return BatchResult(
+        training_class.__name__, duration, distance, speed, calories
+    )
+
+
+@dataclass(frozen=True)
+class RangeRule:
+    """Допустимый диапазон значений поля тренировки."""
+    name: str
+    minimum: float
+    maximum: float
+    include_minimum: bool = True
+
+    def failures(self, column) -> list[int]:
+        """Номера строк, значения которых вне диапазона.
+
+        Значения NaN тоже считаются недопустимыми.
+        """
+        low = self.minimum
+        high = self.maximum
+        if self.include_minimum:
+            return [
+                index for index, value in enumerate(column)
+                if not low <= value <= high
+            ]
+        return [
+            index for index, value in enumerate(column)
+            if not low < value <= high
+        ]
+
+
+# Правила проверяются по порядку, у строки запоминается первое нарушение.
+RULES = (
+    RangeRule('duration', 0, 24, include_minimum=False),
+    RangeRule('weight', 0, 400, include_minimum=False),
+    RangeRule('height', 0, 260, include_minimum=False),
+    RangeRule('length_pool', 0, 100, include_minimum=False),
+    RangeRule('count_pool', 0, 10_000),
+    RangeRule('action', 0, 1_000_000),
+)
+
+
+def check_columns(workout_type: str, columns, rules=RULES) -> array:
+    """Коды нарушений по строкам: 0 - строка допустима.
+
+    Код - номер правила в `rules`, начиная с единицы. Правила для
+    полей, которых нет у типа тренировки, пропускаются.
+    """
+    names = get_spec(workout_type).field_names
+    reasons = array('B', bytes(len(columns['duration'])))
+    for code, rule in enumerate(rules, 1):
+        if rule.name not in names:
+            continue
+        for index in rule.failures(columns[rule.name]):
+            if not reasons[index]:
+                reasons[index] = code
+    return reasons
+
+
+@dataclass
+class CheckedResult:
+    """Результат расчёта с отложенными недопустимыми строками."""
+    result: BatchResult
+    accepted: array
+    rejected: 'TrainingBatch'
+    rejected_indexes: array
+    reasons: list[str]
+
+
+def compute_checked(workout_type: str, columns, rules=RULES) -> CheckedResult:
+    """Рассчитать допустимые строки, отложив недопустимые в сторону.
+
+    Строки отбираются масками по колонкам, поэтому расчёт допустимых
+    идёт без проверок внутри цикла по строкам.
+    """
+    reasons = check_columns(workout_type, columns, rules)
+    valid = bytes(map(not_, reasons))
+    invalid = bytes(map(bool, reasons))
+    indexes = range(len(reasons))
+    result = compute_batch(workout_type, {
+        name: array(typecode_of(column), compress(column, valid))
+        for name, column in columns.items()
+    })
+    rejected = TrainingBatch(workout_type, {
+        name: array(typecode_of(column), compress(column, invalid))
+        for name, column in columns.items()
+    })
+    return CheckedResult(
+        result,
+        array('q', compress(indexes, valid)),
+        rejected,
+        array('q', compress(indexes, invalid)),
+        [rules[code - 1].name for code in reasons if code],
+    )
+
+
+# Коды типов `array` для аннотаций полей; остальные поля хранятся
+# как double.
+TYPECODES = {int: 'q', float: 'd'}
+
+
+def typecode_of(column) -> str:
+    """Код типа колонки; для списков и других коллекций - 'd'."""
+    return getattr(column, 'typecode', 'd')
+
+
+def field_typecodes(training_class: type) -> dict:
+    """Коды типов колонок по аннотациям полей класса тренировки."""
+    return {
+        data_field.name: TYPECODES.get(data_field.type, 'd')
+        for data_field in fields(training_class)
+        if data_field.init
+    }
+
+
+def column_array(typecode: str, values) -> array:
+    """Колонка с кодом `typecode`.
+
+    Целочисленная колонка с дробными или слишком большими значениями
+    хранится как double.
+    """
+    values = list(map(float, values))
+    if typecode == 'q' and all(map(float.is_integer, values)):
+        try:
+            return array('q', map(int, values))
+        except OverflowError:
+            pass
+    return array('d', values)
+
+
+class TrainingBatch:
+    """Колоночное хранилище тренировок одного типа.
+
+    Тип колонки выбирается по аннотации поля: целые поля хранятся
+    в `array('q')`, остальные в `array('d')`.
+    """
+
+    def __init__(self, workout_type: str, columns=None) -> None:
+        self.workout_type = workout_type
+        self.spec = get_spec(workout_type)
+        self.training_class = self.spec.training_class
+        self.names = self.spec.field_names
+        if columns is None:
+            typecodes = field_typecodes(self.training_class)
+            columns = {name: array(typecodes[name]) for name in self.names}
+        self.columns = columns
+
+    @classmethod
+    def from_rows(cls, workout_type: str, rows) -> 'TrainingBatch':
+        """Создать хранилище из списков данных датчиков.
+
+        Количество значений проверяется один раз для всех строк,
+        значения переводятся в числа по колонкам, поэтому подходят
+        и строки из текстовых форматов.
+        """
+        spec = get_spec(workout_type)
+        rows = list(rows)
+        lengths = set(map(len, rows))
+        lengths.discard(spec.arity)
+        if lengths:
+            raise wrong_len_error(min(lengths), spec.arity)
+        columns = zip(*rows) if rows else [()] * spec.arity
+        typecodes = field_typecodes(spec.training_class)
+        return cls(workout_type, {
+            name: column_array(typecodes[name], column)
+            for name, column in zip(spec.field_names, columns)
+        })
+
+    def __len__(self) -> int:
+        return len(self.columns['duration'])
+
+    def __getitem__(self, index: int):
+        """Создать объект тренировки для строки `index`."""
+        return self.training_class(
+            *(self.columns[name][index] for name in self.names)
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, data) -> None:
+        """Добавить строку данных датчиков."""
+        if len(data) != self.spec.arity:
+            raise wrong_len_error(len(data), self.spec.arity)
+        for name, value in zip(self.names, data):
+            column = self.columns[name]
+            if typecode_of(column) == 'q' and not isinstance(value, int):
+                # Дробное значение переводит колонку в double.
+                column = self.columns[name] = array('d', column)
+            column.append(value)
+
+    def extend(self, rows) -> None:
+        """Добавить строки данных датчиков."""
+        for data in rows:
+            self.append(data)
+
+    @property
+    def nbytes(self) -> int:
+        """Размер данных колонок в байтах."""
+        return sum(
+            len(column) * column.itemsize
+            for column in self.columns.values()
+        )
+
+    def compute(self) -> BatchResult:
+        """Рассчитать все тренировки хранилища."""
+        return compute_batch(self.workout_type, self.columns)
+
+    def compute_checked(self, rules=RULES) -> CheckedResult:
+        """Рассчитать допустимые тренировки, отложив остальные."""
+        return compute_checked(self.workout_type, self.columns, rules)
+
+
+def compute_packages(chunk: list, rules=RULES) -> tuple[list, list]:
+    """Рассчитать порцию пакетов, сохранив их порядок.
+
+    Возвращает список той же длины с кортежами значений полей
+    `InfoMessage` и список отказов `(номер в порции, поле)`. На месте
+    строк, не прошедших проверки `rules`, в первом списке стоит None.
+    """
+    rows = {}
+    positions = {}
+    for index, (workout_type, data) in enumerate(chunk):
+        if workout_type not in rows:
+            rows[workout_type] = []
+            positions[workout_type] = []
+        rows[workout_type].append(data)
+        positions[workout_type].append(index)
+    results = [None] * len(chunk)
+    rejected = []
+    for workout_type, type_rows in rows.items():
+        type_positions = positions[workout_type]
+        checked = TrainingBatch.from_rows(
+            workout_type, type_rows
+        ).compute_checked(rules)
+        result = checked.result
+        for row, values in zip(checked.accepted, zip(
+            repeat(result.training_type),
+            result.duration,
+            result.distance,
+            result.speed,
+            result.calories
+        )):
+            results[type_positions[row]] = values
+        rejected.extend(
+            (type_positions[row], reason)
+            for row, reason in zip(checked.rejected_indexes, checked.reasons)
+        )
+    rejected.sort()
+    return results, rejected
+
+
+def print_rejected(index: int, reason: str, file=None) -> None:
+    """Сообщить об отвергнутом пакете в `file` или в stderr."""
+    print(
+        ERROR_RANGE_MESSAGE.format(index=index, name=reason),
+        file=file or sys.stderr
+    )
+
+
+def _info_messages(offset: int, computed: tuple, on_reject):
+    results, rejected = computed
+    if on_reject is not None:
+        for index, reason in rejected:
+            on_reject(offset + index, reason)
+    for values in results:
+        if values is not None:
+            yield InfoMessage(*values)
+
+
+def process_parallel(
+    packages,
+    workers: int = None,
+    chunk_size: int = CHUNK_SIZE,
+    on_reject=None,
+):
+    """Рассчитать пакеты в пуле процессов.
+
+    Пакеты передаются процессам порциями кортежей, результаты
+    возвращаются как `InfoMessage` в порядке поступления пакетов.
+    Пакеты, не прошедшие проверки `RULES`, пропускаются, а их номер
+    и поле передаются в `on_reject`.
+    """
+    chunks = iter_chunks(
+        ((workout_type, tuple(data)) for workout_type, data in packages),
+        chunk_size
+    )
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Держим в работе ограниченное число порций, чтобы не читать
+        # весь поток пакетов в память раньше времени.
+        pending = deque()
+        limit = 2 * workers
+        offset = 0
+        for chunk in chunks:
+            pending.append(
+                (offset, executor.submit(compute_packages, chunk))
+            )
+            offset += len(chunk)
+            if len(pending) >= limit:
+                start, future = pending.popleft()
+                yield from _info_messages(start, future.result(), on_reject)
+        while pending:
+            start, future = pending.popleft()
+            yield from _info_messages(start, future.result(), on_reject)
@@ -0,0 +1,75 @@
+"""Память на один объект тренировки и информационного сообщения.
+
+Запуск: python benchmarks/memory.py [--count N] [--json]
+"""
+import argparse
+import json
+import sys
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homework import InfoMessage, SPECS  # noqa: E402
+
+PACKAGES = {
+    'SWM': [720, 1, 80, 25, 40],
+    'RUN': [15000, 1, 75],
+    'WLK': [9000, 1, 75, 180],
+}
+
+# Вариант сообщения с `__dict__` для сравнения со слотами.
+DictInfoMessage = make_dataclass(
+    'InfoMessage', [(field.name, field.type) for field in fields(InfoMessage)]
+)
+
+
+def bytes_per_instance(factory, count: int) -> float:
+    """Средний прирост памяти на один объект из `factory`."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Память самого списка не относится к объектам.
+    return (after - before - sys.getsizeof(objects)) / count
+
+
+def run(count: int) -> dict:
+    """Измерить память для всех типов тренировок и сообщений."""
+    results = {}
+    for workout_type, data in PACKAGES.items():
+        spec = SPECS[workout_type]
+        results[spec.training_class.__name__] = {
+            'before': bytes_per_instance(
+                lambda: spec.training_class(*data), count
+            ),
+            'after': bytes_per_instance(
+                lambda: spec.compact_class(*data), count
+            ),
+        }
+    values = ('Running', 1.0, 9.75, 9.75, 797.805)
+    results['InfoMessage'] = {
+        'before': bytes_per_instance(
+            lambda: DictInfoMessage(*values), count
+        ),
+        'after': bytes_per_instance(lambda: InfoMessage(*values), count),
+    }
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100_000)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+    results = run(args.count)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, sizes in results.items():
+            print(
+                f'{name}: {sizes["before"]:.1f} -> '
+                f'{sizes["after"]:.1f} байт на объект'
+            )
@@ -0,0 +1,170 @@
+"""Замеры скорости и памяти основных этапов расчёта тренировок.
+
+Запуск: python benchmarks/run.py [--sizes 1 1000 1000000]
+[--output result.json] [--compare previous.json]
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cache import ResultCache  # noqa: E402
+from homework import read_package  # noqa: E402
+
+SIZES = (1, 1_000, 1_000_000)
+REPEAT = 3
+
+PACKAGES = {
+    'SWM': [720, 1, 80, 25, 40],
+    'RUN': [15000, 1, 75],
+    'WLK': [9000, 1, 75, 180],
+}
+
+
+def make_packages(size: int) -> list[tuple]:
+    """Пакеты всех типов по кругу."""
+    packages = list(PACKAGES.items())
+    return [packages[index % len(packages)] for index in range(size)]
+
+
+def setup_read_package(size: int):
+    packages = make_packages(size)
+    return lambda: [read_package(*package) for package in packages]
+
+
+def setup_spent_calories(workout_type: str):
+    def setup(size: int):
+        data = PACKAGES[workout_type]
+        trainings = [read_package(workout_type, data) for _ in range(size)]
+        return lambda: [
+            training.get_spent_calories() for training in trainings
+        ]
+    return setup
+
+
+def setup_show_training_info(size: int):
+    trainings = [read_package(*package) for package in make_packages(size)]
+    return lambda: [training.show_training_info() for training in trainings]
+
+
+def setup_get_message(size: int):
+    infos = [
+        read_package(*package).show_training_info()
+        for package in make_packages(size)
+    ]
+    return lambda: [info.get_message() for info in infos]
+
+
+def setup_recompute_info(size: int):
+    packages = make_packages(size)
+    return lambda: [
+        read_package(*package).show_training_info() for package in packages
+    ]
+
+
+def setup_cached_info(size: int):
+    packages = make_packages(size)
+    results = ResultCache()
+    for package in packages[:len(PACKAGES)]:
+        results.get_info(*package)
+    return lambda: [results.get_info(*package) for package in packages]
+
+
+CASES = {
+    'read_package': setup_read_package,
+    'get_spent_calories[RUN]': setup_spent_calories('RUN'),
+    'get_spent_calories[WLK]': setup_spent_calories('WLK'),
+    'get_spent_calories[SWM]': setup_spent_calories('SWM'),
+    'show_training_info': setup_show_training_info,
+    'get_message': setup_get_message,
+    'recompute_info': setup_recompute_info,
+    'cached_info': setup_cached_info,
+}
+
+
+def measure(setup, size: int, repeat: int = REPEAT) -> dict:
+    """Лучшее время из `repeat` прогонов и пик памяти одного прогона.
+
+    Перед каждым прогоном данные готовятся заново, чтобы состояние
+    прошлого прогона, например заполненный кэш, не влияло на замер.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        run = setup(size)
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    run = setup(size)
+    gc.collect()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'seconds': best,
+        'ops_per_sec': size / best if best else None,
+        'peak_bytes': peak,
+        'peak_bytes_per_op': peak / size,
+    }
+
+
+def run_all(sizes=SIZES, cases=None, repeat: int = REPEAT) -> dict:
+    """Выполнить замеры и вернуть результат для сохранения в JSON."""
+    results = []
+    for name, setup in CASES.items():
+        if cases and name not in cases:
+            continue
+        for size in sizes:
+            results.append(
+                {'case': name, 'size': size, **measure(setup, size, repeat)}
+            )
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'results': results,
+    }
+
+
+def compare(previous: dict, current: dict) -> list[str]:
+    """Строки сравнения времени с предыдущим замером."""
+    before = {
+        (result['case'], result['size']): result
+        for result in previous['results']
+    }
+    lines = []
+    for result in current['results']:
+        old = before.get((result['case'], result['size']))
+        if old is None:
+            continue
+        ratio = result['seconds'] / old['seconds']
+        lines.append(
+            f'{result["case"]} x{result["size"]}: '
+            f'{ratio:.2f} от прежнего времени'
+        )
+    return lines
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--cases', nargs='+', choices=list(CASES))
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--output', type=Path)
+    parser.add_argument('--compare', type=Path)
+    args = parser.parse_args()
+    report = run_all(args.sizes, args.cases, args.repeat)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + '\n')
+    else:
+        print(text)
+    if args.compare:
+        previous = json.loads(args.compare.read_text())
+        print('\n'.join(compare(previous, report)), file=sys.stderr)
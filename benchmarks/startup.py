@@ -0,0 +1,52 @@
+"""Время запуска модуля как короткой команды.
+
+Запуск: python benchmarks/startup.py [--repeat N] [--json]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = b'["RUN", [15000, 1, 75]]\n'
+
+COMMANDS = {
+    'python': [sys.executable, '-c', 'pass'],
+    'import homework': [sys.executable, '-c', 'import homework'],
+    'homework.py -': [sys.executable, 'homework.py', '-'],
+}
+
+
+def measure(command: list[str], repeat: int) -> dict:
+    """Минимальное и медианное время запуска команды в миллисекундах."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            command, input=PACKAGE, cwd=ROOT, check=True,
+            stdout=subprocess.DEVNULL
+        )
+        times.append((time.perf_counter() - start) * 1000)
+    return {'min_ms': min(times), 'median_ms': statistics.median(times)}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+    results = {
+        name: measure(command, args.repeat)
+        for name, command in COMMANDS.items()
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, result in results.items():
+            print(
+                f'{name}: {result["min_ms"]:.1f} мс, '
+                f'медиана {result["median_ms"]:.1f} мс'
+            )
@@ -0,0 +1,181 @@
+"""Кэш результатов расчёта для повторно присланных пакетов."""
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from homework import FORMULA_VERSION, InfoMessage, read_package
+
+MAX_ENTRIES = 100_000
+DISK_MAX_ENTRIES = 1_000_000
+
+
+class ResultCache:
+    """Ограниченный по размеру LRU-кэш сообщений о тренировках.
+
+    Ключ - код тренировки и значения данных. Возвращаемые сообщения
+    общие для всех попаданий, изменять их нельзя.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES) -> None:
+        if max_entries < 1:
+            raise ValueError('Размер кэша должен быть положительным')
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_info(self, workout_type: str, data) -> InfoMessage:
+        """Вернуть сообщение о тренировке, посчитав его при промахе."""
+        key = (workout_type, tuple(data))
+        with self._lock:
+            info = self._entries.get(key)
+            if info is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return info
+            self.misses += 1
+        # Расчёт идёт без блокировки, чтобы не задерживать другие потоки.
+        info = read_package(workout_type, data).show_training_info()
+        with self._lock:
+            self._entries[key] = info
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return info
+
+    def clear(self) -> None:
+        """Удалить все записи, сохранив счётчики."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Счётчики попаданий, промахов и вытеснений."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+DISK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    fingerprint BLOB NOT NULL UNIQUE,
+    formula_version INTEGER NOT NULL,
+    training_type TEXT NOT NULL,
+    duration REAL NOT NULL,
+    distance REAL NOT NULL,
+    speed REAL NOT NULL,
+    calories REAL NOT NULL
+);
+"""
+
+SELECT_RESULT = (
+    'SELECT training_type, duration, distance, speed, calories '
+    'FROM results WHERE fingerprint = ?'
+)
+INSERT_RESULT = (
+    'INSERT OR IGNORE INTO results (fingerprint, formula_version, '
+    'training_type, duration, distance, speed, calories) '
+    'VALUES (?, ?, ?, ?, ?, ?, ?)'
+)
+# Записи добавляются с растущим id, поэтому старейшие - с наименьшим.
+DELETE_OLDEST = (
+    'DELETE FROM results WHERE id <= (SELECT max(id) FROM results) - ?'
+)
+
+
+def fingerprint(workout_type: str, data, version: int = None) -> bytes:
+    """Устойчивый между запусками отпечаток пакета и версии формул.
+
+    Значения приводятся к float, поэтому 1 и 1.0 дают один отпечаток.
+    """
+    if version is None:
+        version = FORMULA_VERSION
+    text = ' '.join(
+        [str(version), workout_type, *(float(value).hex() for value in data)]
+    )
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+class PersistentResultCache:
+    """Кэш сообщений о тренировках в файле SQLite.
+
+    Файл можно открыть из нескольких процессов одной машины. При
+    открытии удаляются записи других версий формул, при добавлении -
+    самые старые записи сверх `max_entries`.
+    """
+
+    def __init__(
+        self, path, max_entries: int = DISK_MAX_ENTRIES, timeout: float = 30
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError('Размер кэша должен быть положительным')
+        self.max_entries = max_entries
+        self.version = FORMULA_VERSION
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            path, timeout=timeout, check_same_thread=False
+        )
+        with self.connection:
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.executescript(DISK_SCHEMA)
+            self.connection.execute(
+                'DELETE FROM results WHERE formula_version != ?',
+                (self.version,)
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.connection.execute(
+                'SELECT count(*) FROM results'
+            ).fetchone()[0]
+
+    def get_info(self, workout_type: str, data) -> InfoMessage:
+        """Вернуть сообщение о тренировке, посчитав его при промахе."""
+        key = fingerprint(workout_type, data, self.version)
+        with self._lock:
+            row = self.connection.execute(SELECT_RESULT, (key,)).fetchone()
+            if row is not None:
+                self.hits += 1
+                return InfoMessage(*row)
+            self.misses += 1
+        info = read_package(workout_type, data).show_training_info()
+        with self._lock, self.connection:
+            self.connection.execute(INSERT_RESULT, (
+                key, self.version, info.training_type, info.duration,
+                info.distance, info.speed, info.calories
+            ))
+            self.connection.execute(DELETE_OLDEST, (self.max_entries,))
+        return info
+
+    def stats(self) -> dict:
+        """Счётчики попаданий и промахов этого процесса."""
+        return {
+            'entries': len(self),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def close(self) -> None:
+        """Закрыть файл кэша."""
+        self.connection.close()
+
+    def __enter__(self) -> 'PersistentResultCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,133 @@
+"""Отсев повторно присланных пакетов перед расчётом.
+
+Пакеты запоминаются в двух фильтрах Блума: текущем и предыдущем.
+Когда в текущий добавлено `window` пакетов или прошло `period` секунд,
+предыдущий отбрасывается, а текущий занимает его место. Поэтому
+повтор распознаётся, если он пришёл не позже, чем через одно-два окна,
+а память не зависит от количества пакетов.
+"""
+import math
+import time
+
+from cache import fingerprint
+
+WINDOW = 100_000
+ERROR_RATE = 1e-4
+
+
+class BloomFilter:
+    """Фильтр Блума на `capacity` элементов с долей ложных срабатываний."""
+    __slots__ = ('size', 'hashes', 'bits', 'count')
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.size = max(8, math.ceil(
+            -capacity * math.log(error_rate) / math.log(2) ** 2
+        ))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, key: bytes):
+        """Номера битов ключа: двойное хеширование по двум половинам."""
+        first = int.from_bytes(key[:8], 'little')
+        second = int.from_bytes(key[8:16], 'little') | 1
+        size = self.size
+        return [
+            (first + index * second) % size for index in range(self.hashes)
+        ]
+
+    def contains(self, positions) -> bool:
+        """Установлены ли все биты ключа."""
+        bits = self.bits
+        return all(bits[bit >> 3] & (1 << (bit & 7)) for bit in positions)
+
+    def add(self, positions) -> None:
+        """Установить биты ключа."""
+        bits = self.bits
+        for bit in positions:
+            bits[bit >> 3] |= 1 << (bit & 7)
+        self.count += 1
+
+
+class Deduplicator:
+    """Скользящий фильтр повторов с постоянным расходом памяти."""
+
+    def __init__(
+        self,
+        window: int = WINDOW,
+        error_rate: float = ERROR_RATE,
+        period: float = None,
+        clock=time.monotonic,
+    ) -> None:
+        if window < 1:
+            raise ValueError('Размер окна должен быть положительным')
+        if not 0 < error_rate < 1:
+            raise ValueError('Доля ложных срабатываний должна быть от 0 до 1')
+        self.window = window
+        self.error_rate = error_rate
+        self.period = period
+        self.clock = clock
+        self.seen = 0
+        self.suppressed = 0
+        self.rotations = 0
+        self.current = self.new_filter()
+        self.previous = self.new_filter()
+        self.started = clock()
+
+    def new_filter(self) -> BloomFilter:
+        """Пустой фильтр на одно окно.
+
+        Пакет проверяется по двум фильтрам, и их ложные срабатывания
+        складываются, поэтому каждый рассчитан на половину доли.
+        """
+        return BloomFilter(self.window, self.error_rate / 2)
+
+    def rotate(self) -> None:
+        """Начать новое окно, забыв пакеты позапрошлого."""
+        self.previous = self.current
+        self.current = self.new_filter()
+        self.started = self.clock()
+        self.rotations += 1
+
+    def add(self, workout_type: str, data) -> bool:
+        """Запомнить пакет. False, если такой уже был в окне."""
+        if self.period is not None:
+            elapsed = self.clock() - self.started
+            if elapsed >= 2 * self.period:
+                # После долгого простоя устарели оба окна.
+                self.rotate()
+                self.rotate()
+            elif elapsed >= self.period:
+                self.rotate()
+        if self.current.count >= self.window:
+            self.rotate()
+        self.seen += 1
+        positions = self.current.positions(fingerprint(workout_type, data))
+        if self.current.contains(positions) or self.previous.contains(
+            positions
+        ):
+            self.suppressed += 1
+            return False
+        self.current.add(positions)
+        return True
+
+    def iter_unique(self, packages):
+        """Пропускать дальше только пакеты, которых не было в окне."""
+        add = self.add
+        for package in packages:
+            if add(*package):
+                yield package
+
+    @property
+    def nbytes(self) -> int:
+        """Память под биты обоих фильтров."""
+        return len(self.current.bits) + len(self.previous.bits)
+
+    def stats(self) -> dict:
+        """Счётчики пакетов, отсеянных повторов и смен окна."""
+        return {
+            'seen': self.seen,
+            'suppressed': self.suppressed,
+            'rotations': self.rotations,
+            'nbytes': self.nbytes,
+        }
@@ -1,7 +1,15 @@
-from dataclasses import dataclass, asdict, fields
-
-
-@dataclass
+import sys
+from abc import ABC, ABCMeta, abstractmethod
+from array import array
+from dataclasses import dataclass, field, fields
+from functools import cached_property
+from itertools import islice, starmap
+from operator import attrgetter
+from string import Formatter
+from types import CellType, FunctionType
+
+
+@dataclass(slots=True)
 class InfoMessage:
     """Информационное сообщение о тренировке."""
     training_type: str
@@ -19,11 +27,182 @@ class InfoMessage:
     )
 
     def get_message(self) -> str:
-        return self.MESSAGE.format(**asdict(self))
+        return self.MESSAGE.format(
+            training_type=self.training_type,
+            duration=self.duration,
+            distance=self.distance,
+            speed=self.speed,
+            calories=self.calories
+        )
+
+
+MESSAGES_CHUNK_SIZE = 4096
+
+
+def positional_template(message_class: type = InfoMessage) -> str:
+    """Шаблон `MESSAGE`, в котором поля заменены их номерами."""
+    indexes = {
+        message_field.name: str(index)
+        for index, message_field in enumerate(fields(message_class))
+    }
+    parts = []
+    for literal, name, spec, conversion in Formatter().parse(
+        message_class.MESSAGE
+    ):
+        parts.append(literal.replace('{', '{{').replace('}', '}}'))
+        if name is None:
+            continue
+        # Заменяем только имя поля, обращения к атрибутам и индексы
+        # после него остаются как есть.
+        split = min(
+            (name.index(mark) for mark in '.[' if mark in name),
+            default=len(name)
+        )
+        parts.append(
+            '{' + indexes.get(name[:split], name[:split]) + name[split:]
+        )
+        if conversion:
+            parts.append('!' + conversion)
+        parts.append((':' + spec if spec else '') + '}')
+    return ''.join(parts)
+
+
+def message_formatter(message_class: type = InfoMessage):
+    """Вернуть функцию, форматирующую сообщение без создания словаря.
+
+    Значения полей берутся одним `attrgetter` и подставляются
+    в позиционный шаблон.
+    """
+    render = positional_template(message_class).format
+    get_values = attrgetter(
+        *(message_field.name for message_field in fields(message_class))
+    )
+    return lambda info: render(*get_values(info))
+
+
+def format_messages(infos) -> str:
+    """Собрать текст сообщений, по одному в строке."""
+    render = message_formatter()
+    return ''.join([render(info) + '\n' for info in infos])
+
+
+class Sink(ABC):
+    """Приёмник текстов сообщений о тренировках."""
+
+    def write(self, message: str) -> None:
+        """Принять одно сообщение."""
+        self.write_many([message])
+
+    @abstractmethod
+    def write_many(self, messages: list[str]) -> None:
+        """Принять список сообщений."""
+
+    def flush(self) -> None:
+        """Передать дальше всё накопленное."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.flush()
+
+
+class BufferedSink(Sink):
+    """Накапливает сообщения и пишет их в файл одной строкой.
+
+    Без файла пишет в текущий `sys.stdout`.
+    """
+
+    def __init__(self, file=None, buffer_size: int = MESSAGES_CHUNK_SIZE):
+        self.file = file
+        self.buffer_size = buffer_size
+        self.buffer = []
+
+    def write(self, message: str) -> None:
+        self.buffer.append(message)
+        if len(self.buffer) >= self.buffer_size:
+            self.write_buffer()
+
+    def write_many(self, messages: list[str]) -> None:
+        self.buffer.extend(messages)
+        if len(self.buffer) >= self.buffer_size:
+            self.write_buffer()
+
+    def write_buffer(self) -> None:
+        """Записать накопленные сообщения без сброса буфера файла."""
+        if self.buffer:
+            file = self.file or sys.stdout
+            file.write('\n'.join(self.buffer) + '\n')
+            self.buffer = []
+
+    def flush(self) -> None:
+        self.write_buffer()
+        (self.file or sys.stdout).flush()
+
+
+class ListSink(Sink):
+    """Сохраняет сообщения в списке `messages`."""
+
+    def __init__(self) -> None:
+        self.messages = []
+
+    def write(self, message: str) -> None:
+        self.messages.append(message)
+
+    def write_many(self, messages: list[str]) -> None:
+        self.messages.extend(messages)
+
+
+class CallbackSink(Sink):
+    """Передаёт каждое сообщение в функцию `callback`."""
+
+    def __init__(self, callback) -> None:
+        self.callback = callback
+
+    def write(self, message: str) -> None:
+        self.callback(message)
+
+    def write_many(self, messages: list[str]) -> None:
+        for message in messages:
+            self.callback(message)
+
+
+class NullSink(Sink):
+    """Отбрасывает сообщения."""
+
+    def write(self, message: str) -> None:
+        pass
+
+    def write_many(self, messages: list[str]) -> None:
+        pass
+
+
+def as_sink(output, buffer_size: int = MESSAGES_CHUNK_SIZE) -> Sink:
+    """Вернуть приёмник как есть, а файл обернуть в `BufferedSink`."""
+    if isinstance(output, Sink):
+        return output
+    return BufferedSink(output, buffer_size)
+
+
+def write_messages(
+    infos, output, chunk_size: int = MESSAGES_CHUNK_SIZE
+) -> int:
+    """Передать сообщения в файл или приёмник порциями.
+
+    В конце приёмник сбрасывается. Возвращает количество сообщений.
+    """
+    render = message_formatter()
+    sink = as_sink(output, chunk_size)
+    count = 0
+    for chunk in iter_chunks(infos, chunk_size):
+        sink.write_many([render(info) for info in chunk])
+        count += len(chunk)
+    sink.flush()
+    return count
 
 
 @dataclass
-class Training:
+class Training(metaclass=ABCMeta):
     """Базовый класс тренировки."""
     M_IN_KM = 1000
     LEN_STEP = 0.65
@@ -37,21 +216,34 @@ class Training:
         """Получить дистанцию в км."""
         return self.action * self.LEN_STEP / self.M_IN_KM
 
-    def get_mean_speed(self) -> float:
+    def get_mean_speed(self, distance: float = None) -> float:
         """Получить среднюю скорость движения."""
-        return self.get_distance() / self.duration
+        if distance is None:
+            distance = self.get_distance()
+        return distance / self.duration
 
-    def get_spent_calories(self) -> float:
+    def get_spent_calories(self, speed: float = None) -> float:
         """Получить количество затраченных калорий."""
 
     def show_training_info(self) -> InfoMessage:
-        """Вернуть информационное сообщение о выполненной тренировке."""
+        """Вернуть информационное сообщение о выполненной тренировке.
+
+        Дистанция и скорость считаются один раз и передаются
+        в следующие расчёты готовыми. Методы, подменённые на самом
+        объекте, вызываются без аргументов, как в исходной версии.
+        """
+        overrides = getattr(self, '__dict__', ())
+        distance = self.get_distance()
+        if 'get_mean_speed' in overrides:
+            speed = self.get_mean_speed()
+        else:
+            speed = self.get_mean_speed(distance)
+        if 'get_spent_calories' in overrides:
+            calories = self.get_spent_calories()
+        else:
+            calories = self.get_spent_calories(speed)
         return InfoMessage(
-            type(self).__name__,
-            self.duration,
-            self.get_distance(),
-            self.get_mean_speed(),
-            self.get_spent_calories()
+            type(self).__name__, self.duration, distance, speed, calories
         )
 
 
@@ -61,10 +253,12 @@ class Running(Training):
     CALORIES_MEAN_SPEED_MULTIPLIER = 18
     CALORIES_MEAN_SPEED_SHIFT = 1.79
 
-    def get_spent_calories(self) -> float:
+    def get_spent_calories(self, speed: float = None) -> float:
         """Получить количество затраченных калорий."""
+        if speed is None:
+            speed = self.get_mean_speed()
         return (
-            (self.CALORIES_MEAN_SPEED_MULTIPLIER * self.get_mean_speed()
+            (self.CALORIES_MEAN_SPEED_MULTIPLIER * speed
              + self.CALORIES_MEAN_SPEED_SHIFT) * self.weight / self.M_IN_KM
             * self.duration * self.MIN_IN_HOUR
         )
@@ -80,12 +274,14 @@ class SportsWalking(Training):
 
     height: float
 
-    def get_spent_calories(self) -> float:
+    def get_spent_calories(self, speed: float = None) -> float:
+        if speed is None:
+            speed = self.get_mean_speed()
         return (
             (
                 self.WEIGHT_MULTIPLIER * self.weight
                 + (
-                    (self.get_mean_speed() * self.K_H_TO_M_S)**2
+                    (speed * self.K_H_TO_M_S)**2
                     / (self.height / self.CM_IN_M)
                 )
                 * self.SPEED_MULTIPLIER
@@ -106,7 +302,7 @@ class Swimming(Training):
     length_pool: float
     count_pool: int
 
-    def get_mean_speed(self) -> float:
+    def get_mean_speed(self, distance: float = None) -> float:
         return (
             self.length_pool
             * self.count_pool
@@ -114,14 +310,20 @@ class Swimming(Training):
             / self.duration
         )
 
-    def get_spent_calories(self) -> float:
+    def get_spent_calories(self, speed: float = None) -> float:
+        if speed is None:
+            speed = self.get_mean_speed()
         return (
-            (self.get_mean_speed() + self.CALORIES_MEAN_SPEED_SHIFT)
+            (speed + self.CALORIES_MEAN_SPEED_SHIFT)
             * self.MEAN_SPEED_MULTIPLIER
             * self.weight * self.duration
         )
 
 
+# Увеличивается при любом изменении формул: сохранённые результаты
+# с другой версией считаются устаревшими.
+FORMULA_VERSION = 1
+
 CLASSES = {
     'SWM': Swimming,
     'RUN': Running,
@@ -133,6 +335,8 @@ ERROR_TYPE_MESSAGE = (
     'ни одному доступному типу из: {classes_type}'
 )
 
+ERROR_PACKAGE_MESSAGE = 'Пакет должен иметь вид (workout_type, data)'
+
 ERROR_WRONG_LEN_MESSAGE = (
     'Количество элементов, необходимые для '
     'создания объекта класса, несоответствуют '
@@ -142,39 +346,433 @@ ERROR_WRONG_LEN_MESSAGE = (
 )
 
 
+# Атрибуты, которые `dataclass` и `ABCMeta` создают заново
+# для компактного класса.
+DATACLASS_GENERATED = frozenset((
+    '__dict__', '__weakref__', '__dataclass_fields__',
+    '__dataclass_params__', '__init__', '__repr__', '__eq__', '__hash__',
+    '__match_args__', '__abstractmethods__', '_abc_impl',
+))
+
+COMPACT_CLASSES = {}
+
+
+def rebind_class_cell(value, cell: CellType):
+    """Копия функции, в которой `super()` без аргументов видит `cell`.
+
+    Методы, свойства и методы класса без ячейки `__class__`
+    возвращаются как есть.
+    """
+    if isinstance(value, (classmethod, staticmethod)):
+        function = rebind_class_cell(value.__func__, cell)
+        return value if function is value.__func__ else type(value)(function)
+    if isinstance(value, property):
+        accessors = [
+            rebind_class_cell(accessor, cell) if accessor else None
+            for accessor in (value.fget, value.fset, value.fdel)
+        ]
+        return property(*accessors, value.__doc__)
+    if not isinstance(value, FunctionType):
+        return value
+    names = value.__code__.co_freevars
+    if '__class__' not in names:
+        return value
+    closure = list(value.__closure__)
+    closure[names.index('__class__')] = cell
+    function = FunctionType(
+        value.__code__, value.__globals__, value.__name__,
+        value.__defaults__, tuple(closure)
+    )
+    function.__kwdefaults__ = value.__kwdefaults__
+    function.__qualname__ = value.__qualname__
+    function.__annotations__ = value.__annotations__
+    function.__dict__.update(value.__dict__)
+    return function
+
+
+def compact_class(training_class: type) -> type:
+    """Вернуть вариант класса тренировки со `__slots__`.
+
+    Компактный класс повторяет поля, константы и методы исходного,
+    но его объекты не хранят `__dict__`. Методы нельзя подменить
+    на отдельном объекте, поэтому исходные классы остаются прежними.
+    Компактный класс зарегистрирован как подкласс исходного, так что
+    проверки `isinstance` проходят. Имя `__name__` у него то же, ведь
+    оно выводится в сообщении, а `__qualname__` начинается с `Compact`.
+    """
+    if training_class in COMPACT_CLASSES:
+        return COMPACT_CLASSES[training_class]
+    parent = training_class.__bases__[0]
+    base = object if parent is object else compact_class(parent)
+    # Ячейка `__class__` для `super()` в скопированных методах:
+    # заполняется, когда компактный класс создан.
+    class_cell = CellType()
+    namespace = {
+        name: rebind_class_cell(value, class_cell)
+        for name, value in training_class.__dict__.items()
+        if name not in DATACLASS_GENERATED
+    }
+    for name in namespace.get('__annotations__', {}):
+        # Переносим настройки полей, а не только значения по умолчанию.
+        source = training_class.__dataclass_fields__[name]
+        namespace[name] = field(
+            default=source.default,
+            default_factory=source.default_factory,
+            init=source.init,
+            repr=source.repr,
+            hash=source.hash,
+            compare=source.compare,
+            metadata=source.metadata,
+            kw_only=source.kw_only,
+        )
+    namespace['__qualname__'] = f'Compact{training_class.__qualname__}'
+    compact = dataclass(slots=True)(
+        type(training_class.__name__, (base,), namespace)
+    )
+    class_cell.cell_contents = compact
+    training_class.register(compact)
+    COMPACT_CLASSES[training_class] = compact
+    return compact
+
+
+@dataclass(frozen=True)
+class WorkoutSpec:
+    """Описание типа тренировки, вычисленное при регистрации."""
+    training_class: type
+    field_names: tuple
+    arity: int
+
+    @cached_property
+    def compact_class(self) -> type:
+        """Вариант класса со `__slots__`, создаётся при первом обращении."""
+        return compact_class(self.training_class)
+
+    @cached_property
+    def batch_kernel(self):
+        """Расчёт по колонкам, собирается при первом обращении."""
+        from kernels import compile_batch_kernel
+
+        return compile_batch_kernel(self.training_class, self.field_names)
+
+
+SPECS = {}
+
+
+def register_training(workout_type: str, training_class: type) -> None:
+    """Зарегистрировать класс тренировки под кодом `workout_type`.
+
+    Класс - наследник `Training`, объявленный через `dataclass`,
+    с полями данных и методом `get_spent_calories(speed)`.
+    """
+    field_names = tuple(
+        data_field.name
+        for data_field in fields(training_class)
+        if data_field.init
+    )
+    CLASSES[workout_type] = training_class
+    SPECS[workout_type] = WorkoutSpec(
+        training_class,
+        field_names,
+        len(field_names)
+    )
+
+
+for workout_code, workout_class in list(CLASSES.items()):
+    register_training(workout_code, workout_class)
+
+
+def unknown_type_error(workout_type: str) -> TypeError:
+    """Ошибка неизвестного кода тренировки."""
+    return TypeError(
+        ERROR_TYPE_MESSAGE.format(
+            workout_type=workout_type,
+            classes_type=' '.join(CLASSES.keys())
+        )
+    )
+
+
+def wrong_len_error(given: int, needed: int) -> TypeError:
+    """Ошибка количества параметров в пакете."""
+    return TypeError(
+        ERROR_WRONG_LEN_MESSAGE.format(
+            given_parameters=given,
+            needed_parameters=needed
+        )
+    )
+
+
+def find_spec(workout_type: str):
+    """Описание типа по коду или None для неизвестного кода.
+
+    Класс, добавленный прямо в `CLASSES`, регистрируется
+    при первом обращении.
+    """
+    spec = SPECS.get(workout_type)
+    if spec is None and workout_type in CLASSES:
+        register_training(workout_type, CLASSES[workout_type])
+        spec = SPECS[workout_type]
+    return spec
+
+
+def get_spec(workout_type: str) -> WorkoutSpec:
+    """Получить описание типа тренировки по коду."""
+    spec = find_spec(workout_type)
+    if spec is None:
+        raise unknown_type_error(workout_type)
+    return spec
+
+
 def read_package(workout_type: str, data: list[int]) -> Training:
     """Прочитать данные полученные от датчиков."""
+    spec = SPECS.get(workout_type) or find_spec(workout_type)
+    if spec is None:
+        raise unknown_type_error(workout_type)
     # Сравниваем количество необходимых аргументов для
     # создания объекта с длинной data
-    if workout_type not in CLASSES:
-        raise TypeError(
-            ERROR_TYPE_MESSAGE.format(
-                workout_type=workout_type,
-                classes_type=' '.join(CLASSES.keys())
-            )
-        )
-    len_args = len(fields(CLASSES[workout_type]))
-    if len_args != len(data):
-        raise TypeError(
-            ERROR_WRONG_LEN_MESSAGE.format(
-                given_parameters=len(data),
-                needed_parameters=len_args
-            )
-        )
-    return CLASSES[workout_type](*data)
+    if spec.arity != len(data):
+        raise wrong_len_error(len(data), spec.arity)
+    return spec.training_class(*data)
 
 
-def main(training: Training) -> None:
-    """Главная функция."""
-    print(training.show_training_info().get_message())
+def read_packages_bulk(
+    workout_type: str, rows, compact: bool = False
+) -> list[Training]:
+    """Прочитать пакет данных одного типа тренировки целиком.
 
+    При `compact=True` создаются объекты компактных классов
+    из `COMPACT_CLASSES`.
+    """
+    spec = get_spec(workout_type)
+    rows = list(rows)
+    lengths = set(map(len, rows))
+    lengths.discard(spec.arity)
+    if lengths:
+        raise wrong_len_error(min(lengths), spec.arity)
+    training_class = spec.compact_class if compact else spec.training_class
+    return list(starmap(training_class, rows))
 
-if __name__ == '__main__':
-    packages = [
-        ('SWM', [720, 1, 80, 25, 40]),
-        ('RUN', [15000, 1, 75]),
-        ('WLK', [9000, 1, 75, 180]),
-    ]
 
+# Коды причин отказа в отчёте `validate_packages`.
+REJECT_UNKNOWN_TYPE = 0
+REJECT_WRONG_LEN = 1
+REJECT_MALFORMED = 2
+REJECT_REASONS = ('unknown_type', 'wrong_len', 'malformed')
+
+
+@dataclass
+class ValidationReport:
+    """Отказы проверки пакетов: номер пакета и код причины.
+
+    Текст ошибки собирается только при обращении к `message`.
+    """
+    indexes: array = field(default_factory=lambda: array('q'))
+    codes: array = field(default_factory=lambda: array('B'))
+    workout_types: list = field(default_factory=list)
+    lengths: array = field(default_factory=lambda: array('q'))
+
+    def __len__(self) -> int:
+        return len(self.indexes)
+
+    def __iter__(self):
+        return zip(self.indexes, map(REJECT_REASONS.__getitem__, self.codes))
+
+    def reject(self, index: int, code: int, workout_type, length) -> None:
+        """Учесть отказ пакета с номером `index`."""
+        self.indexes.append(index)
+        self.codes.append(code)
+        self.workout_types.append(workout_type)
+        self.lengths.append(length)
+
+    def message(self, position: int) -> str:
+        """Текст ошибки для отказа с порядковым номером `position`."""
+        workout_type = self.workout_types[position]
+        if self.codes[position] == REJECT_MALFORMED:
+            return ERROR_PACKAGE_MESSAGE
+        if self.codes[position] == REJECT_UNKNOWN_TYPE:
+            return str(unknown_type_error(workout_type))
+        return str(wrong_len_error(
+            self.lengths[position], SPECS[workout_type].arity
+        ))
+
+    def counts(self) -> dict:
+        """Количество отказов по причинам."""
+        return {
+            reason: self.codes.count(code)
+            for code, reason in enumerate(REJECT_REASONS)
+        }
+
+
+def validate_packages(
+    packages, compact: bool = False
+) -> tuple[list[Training], ValidationReport]:
+    """Прочитать пакеты без исключений на неверных данных.
+
+    Возвращает принятые тренировки и отчёт об отвергнутых пакетах,
+    в том числе о пакетах не вида `(workout_type, data)`.
+    """
+    trainings = []
+    append = trainings.append
+    report = ValidationReport()
+    reject = report.reject
+    get = SPECS.get
+    for index, package in enumerate(packages):
+        # Исключение возникает только на пакете не того вида
+        # и сразу превращается в отказ.
+        try:
+            workout_type, data = package
+            length = len(data)
+            spec = get(workout_type) or find_spec(workout_type)
+        except (TypeError, ValueError):
+            reject(index, REJECT_MALFORMED, None, 0)
+            continue
+        if spec is None:
+            reject(index, REJECT_UNKNOWN_TYPE, workout_type, length)
+        elif spec.arity != length:
+            reject(index, REJECT_WRONG_LEN, workout_type, length)
+        elif compact:
+            append(spec.compact_class(*data))
+        else:
+            append(spec.training_class(*data))
+    return trainings, report
+
+
+def iter_packages(source):
+    """Получать пакеты `(workout_type, data)` из источника по одному."""
+    for workout_type, data in source:
+        yield workout_type, data
+
+
+def iter_chunks(iterable, size: int):
+    """Разбить поток на списки длиной не больше `size`."""
+    if size < 1:
+        raise ValueError('Размер порции должен быть положительным')
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def iter_trainings(packages):
+    """Создавать объекты тренировок из потока пакетов."""
     for workout_type, data in packages:
-        main(read_package(workout_type, data))
+        yield read_package(workout_type, data)
+
+
+def iter_messages(trainings):
+    """Получать информационные сообщения из потока тренировок."""
+    for training in trainings:
+        yield training.show_training_info()
+
+
+def main(training: Training, sink: Sink = None) -> None:
+    """Главная функция."""
+    message = training.show_training_info().get_message()
+    if sink is None:
+        print(message)
+    else:
+        sink.write(message)
+
+
+DEMO_PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+
+def iter_json_packages(lines):
+    """Читать пакеты из строк JSON вида `["RUN", [15000, 1, 75]]`."""
+    import json
+
+    for line in lines:
+        if line.strip():
+            workout_type, data = json.loads(line)
+            yield workout_type, data
+
+
+def write_cached_messages(packages, path) -> None:
+    """Вывести сообщения, беря готовые результаты из кэша на диске."""
+    from cache import PersistentResultCache
+
+    with PersistentResultCache(path) as results:
+        write_messages(starmap(results.get_info, packages), sys.stdout)
+
+
+def cli(argv=None) -> int:
+    """Точка входа командной строки.
+
+    Без аргументов выводит результаты демонстрационных пакетов.
+    Тяжёлые модули импортируются только для режимов, которым нужны.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='homework', description='Расчёт показателей тренировок.'
+    )
+    parser.add_argument(
+        'input', nargs='?', help='файл с пакетами, - для stdin'
+    )
+    parser.add_argument(
+        '--format', choices=('ndjson', 'csv'),
+        help='формат пакетов, по умолчанию по расширению файла'
+    )
+    parser.add_argument(
+        '--workers', type=int,
+        help='считать в пуле из указанного числа процессов'
+    )
+    parser.add_argument(
+        '--cache', help='файл SQLite с результатами прошлых запусков'
+    )
+    args = parser.parse_args(argv)
+    if args.input is None:
+        write_messages(
+            iter_messages(iter_trainings(DEMO_PACKAGES)), sys.stdout
+        )
+        return 0
+    fmt = args.format or (
+        'csv' if args.input.lower().endswith('.csv') else 'ndjson'
+    )
+    if fmt == 'csv' and (args.workers or args.cache):
+        parser.error('--workers и --cache поддерживаются только для ndjson')
+    if args.workers and args.cache:
+        parser.error('--workers нельзя использовать вместе с --cache')
+    file = (
+        sys.stdin if args.input == '-'
+        else open(args.input, encoding='utf-8')
+    )
+    try:
+        if fmt == 'csv':
+            from batch import print_rejected
+            from ingest import ingest
+
+            ingest(file, sys.stdout, 'csv', on_reject=print_rejected)
+        elif args.workers:
+            from batch import print_rejected, process_parallel
+
+            write_messages(
+                process_parallel(
+                    iter_json_packages(file),
+                    workers=args.workers,
+                    on_reject=print_rejected
+                ),
+                sys.stdout
+            )
+        elif args.cache:
+            write_cached_messages(iter_json_packages(file), args.cache)
+        else:
+            write_messages(
+                iter_messages(iter_trainings(iter_json_packages(file))),
+                sys.stdout
+            )
+    finally:
+        if file is not sys.stdin:
+            file.close()
+    return 0
+
+
+if __name__ == '__main__':
+    # Модули `batch`, `ingest` и `cache` импортируют `homework`:
+    # пусть они получат уже выполненный модуль, а не его копию.
+    sys.modules.setdefault('homework', sys.modules[__name__])
+    raise SystemExit(cli())
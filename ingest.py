@@ -0,0 +1,102 @@
+"""Массовая обработка файлов с пакетами в форматах CSV и NDJSON.
+
+CSV: строка `workout_type,значение,значение,...`.
+NDJSON: строка `["workout_type", [значение, ...]]`.
+Файл читается порциями строк, каждая порция считается по колонкам
+для каждого типа тренировки и записывается в вывод одной строкой.
+"""
+import csv
+import json
+
+from batch import compute_packages, print_rejected
+from homework import as_sink, positional_template
+
+READ_HINT = 1 << 20
+FORMATS = ('csv', 'ndjson')
+
+
+def parse_csv(lines) -> list[tuple]:
+    """Разобрать строки CSV в пакеты.
+
+    Значения остаются строками: в числа их переводит
+    `TrainingBatch.from_rows` сразу для целой колонки.
+    """
+    return [(row[0], row[1:]) for row in csv.reader(lines) if row]
+
+
+def parse_ndjson(lines) -> list[tuple]:
+    """Разобрать строки JSON в пакеты."""
+    loads = json.loads
+    return [tuple(loads(line)) for line in lines if line.strip()]
+
+
+PARSERS = {'csv': parse_csv, 'ndjson': parse_ndjson}
+
+
+def detect_format(name: str) -> str:
+    """Определить формат по расширению файла."""
+    return 'csv' if str(name).lower().endswith('.csv') else 'ndjson'
+
+
+def iter_line_chunks(file, hint: int = READ_HINT):
+    """Читать файл порциями строк общим размером около `hint`."""
+    lines = file.readlines(hint)
+    while lines:
+        yield lines
+        lines = file.readlines(hint)
+
+
+def ingest(
+    source,
+    output,
+    fmt: str = 'ndjson',
+    hint: int = READ_HINT,
+    on_reject=None,
+) -> int:
+    """Рассчитать пакеты из `source` и передать сообщения в `output`.
+
+    `output` - файл или приёмник `Sink`. Пакеты со значениями вне
+    допустимых диапазонов пропускаются, их номер и поле передаются
+    в `on_reject`. Возвращает количество рассчитанных пакетов.
+    """
+    parse = PARSERS[fmt]
+    render = positional_template().format
+    sink = as_sink(output, buffer_size=1)
+    count = 0
+    offset = 0
+    for lines in iter_line_chunks(source, hint):
+        packages = parse(lines)
+        results, rejected = compute_packages(packages)
+        if on_reject is not None:
+            for index, reason in rejected:
+                on_reject(offset + index, reason)
+        messages = [
+            render(*values) for values in results if values is not None
+        ]
+        sink.write_many(messages)
+        count += len(messages)
+        offset += len(packages)
+    sink.flush()
+    return count
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('input', help='файл с пакетами, - для stdin')
+    parser.add_argument('--format', choices=FORMATS)
+    parser.add_argument('--output', help='файл для сообщений')
+    args = parser.parse_args()
+    fmt = args.format or detect_format(args.input)
+    source = (
+        sys.stdin if args.input == '-'
+        else open(args.input, encoding='utf-8')
+    )
+    output = (
+        open(args.output, 'w', encoding='utf-8') if args.output
+        else sys.stdout
+    )
+    with source, output:
+        ingest(source, output, fmt, on_reject=print_rejected)
@@ -0,0 +1,169 @@
+"""Счётчики времени по этапам расчёта тренировок.
+
+Замеры включаются вызовом `enable()`: он подменяет `read_package`
+в модуле `homework`, методы `get_spent_calories` зарегистрированных
+классов и `InfoMessage.get_message` обёртками с замером времени.
+`disable()` возвращает исходные функции, поэтому выключенные замеры
+ничего не стоят. Код, импортировавший `read_package` по имени до
+вызова `enable()`, продолжает вызывать исходную функцию.
+"""
+import json
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+import homework
+
+LATENCY_BUCKETS = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 1e-3, 1e-2, float('inf')
+)
+METRIC_NAME = 'training_stage_seconds'
+
+
+class Recorder:
+    """Количество вызовов, суммарное время и гистограмма по этапам."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, workout_type: str, seconds: float) -> None:
+        """Учесть один вызов этапа."""
+        key = (stage, workout_type)
+        with self._lock:
+            metrics = self._stages.get(key)
+            if metrics is None:
+                metrics = self._stages[key] = [
+                    0, 0.0, [0] * len(self.buckets)
+                ]
+            metrics[0] += 1
+            metrics[1] += seconds
+            metrics[2][bisect_left(self.buckets, seconds)] += 1
+
+    def reset(self) -> None:
+        """Сбросить накопленные замеры."""
+        with self._lock:
+            self._stages.clear()
+
+    def snapshot(self) -> dict:
+        """Копия замеров: {этап: {тип тренировки: замеры}}."""
+        with self._lock:
+            stages = {
+                key: (count, seconds, list(buckets))
+                for key, (count, seconds, buckets) in self._stages.items()
+            }
+        result = {}
+        for (stage, workout_type), (count, seconds, buckets) in sorted(
+            stages.items()
+        ):
+            result.setdefault(stage, {})[workout_type] = {
+                'count': count,
+                'seconds': seconds,
+                'buckets': dict(zip(map(str, self.buckets), buckets)),
+            }
+        return result
+
+    def to_json(self) -> str:
+        """Замеры в виде JSON."""
+        return json.dumps(self.snapshot())
+
+    def to_prometheus(self) -> str:
+        """Замеры в текстовом формате Prometheus."""
+        lines = [f'# TYPE {METRIC_NAME} histogram']
+        for stage, workout_types in self.snapshot().items():
+            for workout_type, metrics in workout_types.items():
+                labels = f'stage="{stage}",workout_type="{workout_type}"'
+                total = 0
+                for bound, count in metrics['buckets'].items():
+                    total += count
+                    le = '+Inf' if bound == 'inf' else bound
+                    lines.append(
+                        f'{METRIC_NAME}_bucket{{{labels},le="{le}"}} {total}'
+                    )
+                lines.append(
+                    f'{METRIC_NAME}_sum{{{labels}}} {metrics["seconds"]!r}'
+                )
+                lines.append(
+                    f'{METRIC_NAME}_count{{{labels}}} {metrics["count"]}'
+                )
+        return '\n'.join(lines) + '\n'
+
+
+RECORDER = Recorder()
+
+# Исходные функции, подменённые на время замеров: (владелец, имя, значение).
+# Значение None означает, что атрибута у владельца не было.
+_patched = []
+
+
+def _timed(function, stage: str, get_type, recorder: Recorder):
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            recorder.record(
+                stage, get_type(*args), time.perf_counter() - start
+            )
+    return wrapper
+
+
+def _patch(owner, name: str, stage: str, get_type, recorder) -> None:
+    _patched.append((owner, name, owner.__dict__.get(name)))
+    setattr(
+        owner, name, _timed(getattr(owner, name), stage, get_type, recorder)
+    )
+
+
+def is_enabled() -> bool:
+    """Включены ли замеры."""
+    return bool(_patched)
+
+
+def enable(recorder: Recorder = RECORDER) -> None:
+    """Включить замеры этапов для всех зарегистрированных типов."""
+    if is_enabled():
+        return
+    codes = {}
+    for workout_type, spec in homework.SPECS.items():
+        codes[spec.training_class.__name__] = workout_type
+        for training_class in (spec.training_class, spec.compact_class):
+            _patch(
+                training_class,
+                'get_spent_calories',
+                'get_spent_calories',
+                lambda training, *args: codes[type(training).__name__],
+                recorder
+            )
+    _patch(
+        homework,
+        'read_package',
+        'read_package',
+        lambda workout_type, *args: workout_type,
+        recorder
+    )
+    _patch(
+        homework.InfoMessage,
+        'get_message',
+        'get_message',
+        lambda info: codes.get(info.training_type, info.training_type),
+        recorder
+    )
+
+
+def disable() -> None:
+    """Выключить замеры и вернуть исходные функции."""
+    while _patched:
+        owner, name, original = _patched.pop()
+        if original is None:
+            delattr(owner, name)
+        else:
+            setattr(owner, name, original)
+
+
+def snapshot(recorder: Recorder = RECORDER) -> dict:
+    """Текущие замеры в виде словаря."""
+    return recorder.snapshot()
@@ -0,0 +1,193 @@
+"""Расчёт показателей по колонкам, собранный из методов тренировок.
+
+Выражения из `return` методов расчёта переносятся в один цикл по
+строкам: поля объекта становятся переменными цикла `_f0`, `_f1`, ...,
+константы класса - значениями, вызовы методов расчёта - уже
+посчитанными показателями. Если метод так перенести нельзя, колонки считаются
+через объекты класса.
+"""
+import ast
+import inspect
+import textwrap
+from array import array
+from itertools import starmap
+
+# Метод расчёта, имя показателя и показатель, который метод
+# может принять готовым.
+METRICS = (
+    ('get_distance', 'distance', None),
+    ('get_mean_speed', 'speed', 'distance'),
+    ('get_spent_calories', 'calories', 'speed'),
+)
+METRIC_NAMES = {method: metric for method, metric, _ in METRICS}
+
+KERNEL_TEMPLATE = '''
+def batch_kernel(*columns):
+    distances = array('d')
+    speeds = array('d')
+    calories_column = array('d')
+    add_distance = distances.append
+    add_speed = speeds.append
+    add_calories = calories_column.append
+    for {fields}, in zip(*columns):
+        distance = DISTANCE
+        speed = SPEED
+        calories = CALORIES
+        add_distance(distance)
+        add_speed(speed)
+        add_calories(calories)
+    return distances, speeds, calories_column
+'''
+
+
+class UnsupportedMethod(Exception):
+    """Метод нельзя перенести в расчёт по колонкам."""
+
+
+def field_variable(index: int) -> str:
+    """Имя переменной цикла для поля с номером `index`.
+
+    Поля получают свои имена, чтобы не совпасть с переменными
+    шаблона вроде `speed` или `columns`.
+    """
+    return f'_f{index}'
+
+
+def is_self(node) -> bool:
+    """Является ли узел именем `self`."""
+    return isinstance(node, ast.Name) and node.id == 'self'
+
+
+class MethodInliner(ast.NodeTransformer):
+    """Переписывает выражение метода для цикла по колонкам."""
+
+    def __init__(self, training_class, field_names, arguments) -> None:
+        self.training_class = training_class
+        self.variables = {
+            name: field_variable(index)
+            for index, name in enumerate(field_names)
+        }
+        self.arguments = arguments
+
+    def visit_Call(self, node):
+        function = node.func
+        if (
+            isinstance(function, ast.Attribute) and is_self(function.value)
+            and function.attr in METRIC_NAMES
+        ):
+            return ast.copy_location(
+                ast.Name(METRIC_NAMES[function.attr], ast.Load()), node
+            )
+        raise UnsupportedMethod(ast.unparse(node))
+
+    def visit_Attribute(self, node):
+        if not is_self(node.value):
+            raise UnsupportedMethod(ast.unparse(node))
+        if node.attr in self.variables:
+            return ast.copy_location(
+                ast.Name(self.variables[node.attr], ast.Load()), node
+            )
+        value = getattr(self.training_class, node.attr, None)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            # Константа становится узлом дерева, а не текстом, поэтому
+            # приоритет операций не меняется.
+            return ast.copy_location(ast.Constant(value), node)
+        raise UnsupportedMethod(ast.unparse(node))
+
+    def visit_Name(self, node):
+        if node.id not in self.arguments:
+            raise UnsupportedMethod(node.id)
+        return ast.copy_location(
+            ast.Name(self.arguments[node.id], ast.Load()), node
+        )
+
+
+def is_default_check(statement, arguments) -> bool:
+    """Является ли оператор проверкой `if <аргумент> is None: ...`."""
+    return (
+        isinstance(statement, ast.If) and not statement.orelse
+        and ast.unparse(statement.test) in {
+            f'{name} is None' for name in arguments
+        }
+    )
+
+
+def method_expression(
+    training_class: type, method_name: str, field_names, argument: str
+):
+    """Выражение метода расчёта, переписанное для цикла по колонкам."""
+    try:
+        source = inspect.getsource(getattr(training_class, method_name))
+    except (OSError, TypeError) as error:
+        raise UnsupportedMethod(method_name) from error
+    function = ast.parse(textwrap.dedent(source)).body[0]
+    parameters = [parameter.arg for parameter in function.args.args[1:]]
+    arguments = (
+        {parameters[0]: argument} if parameters and argument else {}
+    )
+    body = function.body
+    if ast.get_docstring(function) is not None:
+        body = body[1:]
+    if not body or not isinstance(body[-1], ast.Return) or not all(
+        is_default_check(statement, arguments) for statement in body[:-1]
+    ):
+        raise UnsupportedMethod(method_name)
+    return MethodInliner(training_class, field_names, arguments).visit(
+        body[-1].value
+    )
+
+
+class Placeholders(ast.NodeTransformer):
+    """Подставляет выражения вместо имён-заглушек шаблона."""
+
+    def __init__(self, expressions: dict) -> None:
+        self.expressions = expressions
+
+    def visit_Name(self, node):
+        return self.expressions.get(node.id, node)
+
+
+def object_kernel(training_class: type):
+    """Расчёт по колонкам через объекты класса тренировки."""
+    def batch_kernel(*columns):
+        infos = [
+            training.show_training_info()
+            for training in starmap(training_class, zip(*columns))
+        ]
+        return tuple(
+            array('d', [getattr(info, metric) for info in infos])
+            for metric in ('distance', 'speed', 'calories')
+        )
+    return batch_kernel
+
+
+def compile_batch_kernel(training_class: type, field_names: tuple):
+    """Создать функцию расчёта показателей по колонкам полей.
+
+    Функция получает колонки в порядке `field_names` и возвращает
+    колонки дистанции, скорости и калорий.
+    """
+    try:
+        expressions = {
+            metric.upper(): method_expression(
+                training_class, method_name, field_names, argument
+            )
+            for method_name, metric, argument in METRICS
+        }
+    except UnsupportedMethod:
+        return object_kernel(training_class)
+    module = Placeholders(expressions).visit(
+        ast.parse(KERNEL_TEMPLATE.format(fields=', '.join(
+            map(field_variable, range(len(field_names)))
+        )))
+    )
+    namespace = {'array': array}
+    exec(
+        compile(
+            ast.fix_missing_locations(module),
+            f'<batch kernel {training_class.__name__}>',
+            'exec'
+        ),
+        namespace
+    )
+    return namespace['batch_kernel']
@@ -0,0 +1,50 @@
+"""Расчёт показателей тренировки, которая ещё идёт."""
+from homework import InfoMessage, Training, get_spec
+
+# Поля, которые датчики присылают приращениями.
+INCREMENTAL_FIELDS = ('action', 'duration', 'count_pool')
+
+
+class LiveSession:
+    """Текущая тренировка, обновляемая приращениями от датчиков.
+
+    Накопленные значения хранятся в объекте класса тренировки, поэтому
+    показатели в любой момент совпадают с расчётом законченной
+    тренировки с теми же данными. Обновление меняет поля объекта,
+    и методы расчёта пересчитывают только нужные значения.
+    """
+
+    def __init__(self, workout_type: str, **params) -> None:
+        spec = get_spec(workout_type)
+        self.workout_type = workout_type
+        self.incremental = tuple(
+            name for name in spec.field_names if name in INCREMENTAL_FIELDS
+        )
+        values = dict.fromkeys(self.incremental, 0)
+        for name, value in params.items():
+            if name not in spec.field_names or name in values:
+                raise TypeError(
+                    f'Параметр {name} нельзя задать для {workout_type}'
+                )
+            values[name] = value
+        self.training: Training = spec.training_class(**values)
+
+    def update(self, **deltas) -> None:
+        """Добавить приращения шагов, гребков, кругов и времени."""
+        training = self.training
+        for name, delta in deltas.items():
+            if name not in self.incremental:
+                raise TypeError(
+                    f'Приращение {name} не поддерживается '
+                    f'для {self.workout_type}'
+                )
+            setattr(training, name, getattr(training, name) + delta)
+
+    def show_training_info(self) -> InfoMessage:
+        """Показатели тренировки на текущий момент."""
+        training = self.training
+        if not training.duration:
+            return InfoMessage(
+                type(training).__name__, 0, training.get_distance(), 0.0, 0.0
+            )
+        return training.show_training_info()
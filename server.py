@@ -0,0 +1,153 @@
+"""Асинхронный сервер приёма пакетов от датчиков.
+
+Протокол: одна строка JSON `[workout_type, data]` на пакет, в ответ
+одна строка JSON с полями `InfoMessage` и текстом сообщения либо
+с описанием ошибки.
+"""
+import asyncio
+import json
+import math
+from numbers import Real
+
+from homework import read_package
+
+MAX_CONNECTIONS = 1024
+LINE_LIMIT = 64 * 1024
+
+ERROR_PACKAGE_MESSAGE = 'Пакет должен иметь вид [workout_type, data]'
+ERROR_LINE_LIMIT_MESSAGE = 'Строка пакета длиннее {limit} байт'
+ERROR_NOT_FINITE_MESSAGE = 'Результат расчёта не является конечным числом'
+
+
+def encode_response(response: dict) -> bytes:
+    """Закодировать ответ в строку JSON."""
+    return json.dumps(
+        response, ensure_ascii=False, allow_nan=False
+    ).encode() + b'\n'
+
+
+def process_line(line: bytes) -> bytes:
+    """Обработать строку с пакетом и вернуть строку ответа."""
+    try:
+        workout_type, data = json.loads(line)
+        if not isinstance(workout_type, str) or not all(
+            isinstance(value, Real) and not isinstance(value, bool)
+            and math.isfinite(value)
+            for value in data
+        ):
+            raise ValueError(ERROR_PACKAGE_MESSAGE)
+        info = read_package(workout_type, data).show_training_info()
+        if not all(map(math.isfinite, (
+            info.duration, info.distance, info.speed, info.calories
+        ))):
+            raise ArithmeticError
+    except ArithmeticError:
+        # Деление на ноль, переполнение и бесконечный результат.
+        response = {'error': ERROR_NOT_FINITE_MESSAGE}
+    except (TypeError, ValueError) as error:
+        response = {'error': str(error) or ERROR_PACKAGE_MESSAGE}
+    else:
+        response = {
+            'training_type': info.training_type,
+            'duration': info.duration,
+            'distance': info.distance,
+            'speed': info.speed,
+            'calories': info.calories,
+            'message': info.get_message(),
+        }
+    return encode_response(response)
+
+
+async def handle_connection(reader, writer, semaphore, limit) -> None:
+    """Обслужить одно подключение до закрытия потока клиентом."""
+    async with semaphore:
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(encode_response({
+                        'error': ERROR_LINE_LIMIT_MESSAGE.format(limit=limit)
+                    }))
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    writer.write(process_line(line))
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def start_server(
+    host: str = None,
+    port: int = None,
+    path: str = None,
+    max_connections: int = MAX_CONNECTIONS,
+    limit: int = LINE_LIMIT,
+):
+    """Запустить TCP-сервер или сервер на Unix-сокете `path`."""
+    semaphore = asyncio.Semaphore(max_connections)
+
+    async def handler(reader, writer):
+        await handle_connection(reader, writer, semaphore, limit)
+
+    if path is not None:
+        return await asyncio.start_unix_server(handler, path, limit=limit)
+    return await asyncio.start_server(handler, host, port, limit=limit)
+
+
+async def send_packages(
+    packages, host: str = None, port: int = None, path: str = None
+) -> list[dict]:
+    """Отправить пакеты серверу и вернуть ответы в том же порядке."""
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+
+    async def write_packages():
+        for package in packages:
+            writer.write(json.dumps(package).encode() + b'\n')
+            await writer.drain()
+        writer.write_eof()
+
+    async def read_responses():
+        return [json.loads(line) async for line in reader]
+
+    try:
+        _, responses = await asyncio.gather(
+            write_packages(), read_responses()
+        )
+        return responses
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def serve(**kwargs) -> None:
+    """Обслуживать подключения до остановки процесса."""
+    server = await start_server(**kwargs)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--unix', dest='path')
+    parser.add_argument(
+        '--max-connections', type=int, default=MAX_CONNECTIONS
+    )
+    args = parser.parse_args()
+    asyncio.run(serve(
+        host=args.host,
+        port=args.port,
+        path=args.path,
+        max_connections=args.max_connections,
+    ))
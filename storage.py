@@ -0,0 +1,219 @@
+"""Хранение пакетов и результатов расчёта в SQLite."""
+import json
+import sqlite3
+from dataclasses import dataclass
+
+from batch import compute_packages
+from homework import FORMULA_VERSION, InfoMessage, iter_chunks
+
+BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS packages (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    workout_type TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS packages_user_time
+    ON packages (user_id, recorded_at);
+CREATE INDEX IF NOT EXISTS packages_type_time
+    ON packages (workout_type, recorded_at);
+CREATE INDEX IF NOT EXISTS packages_time ON packages (recorded_at);
+CREATE TABLE IF NOT EXISTS results (
+    package_id INTEGER PRIMARY KEY
+        REFERENCES packages (id) ON DELETE CASCADE,
+    formula_version INTEGER NOT NULL,
+    training_type TEXT NOT NULL,
+    duration REAL NOT NULL,
+    distance REAL NOT NULL,
+    speed REAL NOT NULL,
+    calories REAL NOT NULL
+);
+"""
+
+INSERT_PACKAGE = (
+    'INSERT INTO packages (id, user_id, recorded_at, workout_type, data) '
+    'VALUES (?, ?, ?, ?, ?)'
+)
+UPSERT_RESULT = (
+    'INSERT OR REPLACE INTO results (package_id, formula_version, '
+    'training_type, duration, distance, speed, calories) '
+    'VALUES (?, ?, ?, ?, ?, ?, ?)'
+)
+SELECT_STALE = (
+    'SELECT p.id, p.workout_type, p.data FROM packages p '
+    'LEFT JOIN results r ON r.package_id = p.id '
+    'WHERE (r.package_id IS NULL OR r.formula_version != ?)'
+)
+
+
+FILTERS = {
+    'user_id': 'p.user_id = ?',
+    'since': 'p.recorded_at >= ?',
+    'until': 'p.recorded_at < ?',
+    'workout_type': 'p.workout_type = ?',
+}
+
+
+def filter_conditions(**filters) -> tuple[list, list]:
+    """Условия и их параметры для заданных фильтров."""
+    conditions = []
+    params = []
+    for name, value in filters.items():
+        if value is not None:
+            conditions.append(FILTERS[name])
+            params.append(value)
+    return conditions, params
+
+
+def filter_clause(**filters) -> tuple[str, list]:
+    """Условие WHERE и его параметры для заданных фильтров."""
+    conditions, params = filter_conditions(**filters)
+    if not conditions:
+        return '', params
+    return ' WHERE ' + ' AND '.join(conditions), params
+
+
+@dataclass
+class StoredTraining:
+    """Тренировка пользователя из хранилища."""
+    package_id: int
+    user_id: str
+    recorded_at: float
+    info: InfoMessage
+
+
+class TrainingStore:
+    """Пакеты и результаты расчёта в базе SQLite."""
+
+    def __init__(self, path) -> None:
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> 'TrainingStore':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _store_results(self, ids, packages) -> None:
+        # Пакеты со значениями вне допустимых диапазонов
+        # остаются без результата.
+        results, _ = compute_packages(packages)
+        self.connection.executemany(UPSERT_RESULT, (
+            (package_id, FORMULA_VERSION, *values)
+            for package_id, values in zip(ids, results)
+            if values is not None
+        ))
+
+    def add_packages(
+        self, records, batch_size: int = BATCH_SIZE, compute: bool = True
+    ) -> int:
+        """Сохранить пакеты `(user_id, recorded_at, workout_type, data)`.
+
+        Каждая порция пишется одной транзакцией через `executemany`;
+        при `compute=True` в той же транзакции сохраняются результаты.
+        Номера пакетов выбираются внутри транзакции, поэтому в одну
+        базу можно писать из нескольких процессов.
+        Возвращает количество сохранённых пакетов.
+        """
+        count = 0
+        for chunk in iter_chunks(records, batch_size):
+            packages = [(record[2], record[3]) for record in chunk]
+            with self.connection:
+                # Блокировка на запись берётся до выбора номеров, чтобы
+                # другие процессы не выбрали те же номера пакетов.
+                self.connection.execute('BEGIN IMMEDIATE')
+                start = self.connection.execute(
+                    'SELECT COALESCE(MAX(id), 0) FROM packages'
+                ).fetchone()[0] + 1
+                ids = range(start, start + len(chunk))
+                self.connection.executemany(INSERT_PACKAGE, (
+                    (package_id, user_id, recorded_at, workout_type,
+                     json.dumps(data))
+                    for package_id, (user_id, recorded_at, workout_type, data)
+                    in zip(ids, chunk)
+                ))
+                if compute:
+                    self._store_results(ids, packages)
+            count += len(chunk)
+        return count
+
+    def compute_results(
+        self, batch_size: int = BATCH_SIZE, **filters
+    ) -> int:
+        """Рассчитать пакеты без результатов или с устаревшими формулами.
+
+        Фильтры те же, что у `query`: пересчитываются только подходящие
+        под них пакеты. Транзакция на запись открывается, только если
+        есть что пересчитать. Возвращает количество пересчитанных пакетов.
+        """
+        conditions, params = filter_conditions(**filters)
+        stale = self.connection.execute(
+            SELECT_STALE + ''.join(
+                ' AND ' + condition for condition in conditions
+            ),
+            (FORMULA_VERSION, *params)
+        ).fetchall()
+        for chunk in iter_chunks(stale, batch_size):
+            with self.connection:
+                self._store_results(
+                    [package_id for package_id, _, _ in chunk],
+                    [(workout_type, json.loads(data))
+                     for _, workout_type, data in chunk]
+                )
+        return len(stale)
+
+    def query(
+        self,
+        user_id: str = None,
+        since: float = None,
+        until: float = None,
+        workout_type: str = None,
+        recompute: bool = False,
+    ) -> list[StoredTraining]:
+        """Тренировки по пользователю, интервалу времени и типу.
+
+        По умолчанию читаются сохранённые результаты, недостающие
+        и устаревшие среди выбранных пакетов сначала досчитываются.
+        При `recompute=True` результаты считаются заново из исходных
+        пакетов.
+        """
+        filters = dict(
+            user_id=user_id,
+            since=since,
+            until=until,
+            workout_type=workout_type
+        )
+        where, params = filter_clause(**filters)
+        if recompute:
+            rows = self.connection.execute(
+                'SELECT p.id, p.user_id, p.recorded_at, p.workout_type, '
+                f'p.data FROM packages p{where} ORDER BY p.recorded_at, p.id',
+                params
+            ).fetchall()
+            results, _ = compute_packages([
+                (row[3], json.loads(row[4])) for row in rows
+            ])
+            return [
+                StoredTraining(row[0], row[1], row[2], InfoMessage(*values))
+                for row, values in zip(rows, results)
+                if values is not None
+            ]
+        self.compute_results(**filters)
+        return [
+            StoredTraining(row[0], row[1], row[2], InfoMessage(*row[3:]))
+            for row in self.connection.execute(
+                'SELECT p.id, p.user_id, p.recorded_at, r.training_type, '
+                'r.duration, r.distance, r.speed, r.calories '
+                'FROM packages p JOIN results r ON r.package_id = p.id'
+                f'{where} ORDER BY p.recorded_at, p.id',
+                params
+            )
+        ]
@@ -0,0 +1,47 @@
+import json
+
+import aggregates
+import homework
+
+
+RUN = homework.read_package('RUN', [15000, 1, 75]).show_training_info()
+WLK = homework.read_package('WLK', [9000, 1, 75, 180]).show_training_info()
+DAY = aggregates.DAY
+
+
+def test_rolling_windows():
+    aggregator = aggregates.RollingAggregator()
+    aggregator.add('anna', 0, RUN)
+    aggregator.add('anna', 2 * DAY, WLK)
+    aggregator.add('ivan', 2 * DAY, WLK)
+    day = aggregator.totals('anna', 'day')
+    week = aggregator.totals('anna', 'week')
+    assert day['count'] == 1 and day['distance'] == WLK.distance, (
+        'Дневное окно должно содержать только тренировки за сутки.'
+    )
+    assert week['count'] == 2
+    assert week['calories'] == RUN.calories + WLK.calories
+    assert aggregator.totals('anna', 'week', now=8 * DAY)['count'] == 1, (
+        'Устаревшие тренировки должны выходить из окна.'
+    )
+    assert aggregator.totals('petr', 'month')['count'] == 0
+
+
+def test_late_training_outside_window():
+    aggregator = aggregates.RollingAggregator()
+    aggregator.add('anna', 10 * DAY, RUN)
+    aggregator.add('anna', 0, WLK)
+    assert aggregator.totals('anna', 'week')['count'] == 1
+    assert aggregator.totals('anna', 'month')['count'] == 2
+
+
+def test_snapshot_restore():
+    aggregator = aggregates.RollingAggregator()
+    aggregator.add('anna', DAY, RUN)
+    state = json.loads(json.dumps(aggregator.snapshot()))
+    restored = aggregates.RollingAggregator.restore(state)
+    restored.add('anna', DAY + 1, WLK)
+    aggregator.add('anna', DAY + 1, WLK)
+    assert restored.totals('anna', 'month') == aggregator.totals(
+        'anna', 'month'
+    ), 'Восстановленное состояние должно совпадать с исходным.'
@@ -0,0 +1,51 @@
+import pytest
+
+import archive
+import homework
+
+
+ROWS = [[9000, 1, 75, 180], [420, 4, 20, 42], [3000.33, 2.512, 75.8, 180.1]]
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    path = tmp_path / 'walking.wka'
+    archive.write_archive(path, 'WLK', ROWS[:2])
+    archive.append_archive(path, ROWS[2:])
+    return path
+
+
+def test_random_access(archive_path):
+    with archive.WorkoutArchive(archive_path) as workouts:
+        assert workouts.workout_type == 'WLK'
+        assert len(workouts) == len(ROWS)
+        assert workouts[-1] == homework.read_package('WLK', ROWS[-1]), (
+            'Архив должен возвращать тренировку по номеру записи.'
+        )
+        with pytest.raises(IndexError):
+            workouts[len(ROWS)]
+
+
+def test_compute_slice(archive_path):
+    with archive.WorkoutArchive(archive_path) as workouts:
+        result = list(workouts.compute(1, 3).iter_info())
+    assert result == [
+        homework.read_package('WLK', row).show_training_info()
+        for row in ROWS[1:3]
+    ], 'Расчёт среза архива должен совпадать с расчётом по объектам.'
+
+
+def test_not_archive(tmp_path):
+    path = tmp_path / 'broken.wka'
+    path.write_bytes(b'0' * 32)
+    with pytest.raises(ValueError):
+        archive.WorkoutArchive(path)
+
+
+@pytest.mark.parametrize('size', [archive.HEADER_SIZE - 4, 40])
+def test_truncated_archive(tmp_path, size):
+    path = tmp_path / 'truncated.wka'
+    archive.write_archive(path, 'RUN', [[15000, 1, 75], [9000, 1, 75]])
+    path.write_bytes(path.read_bytes()[:size])
+    with pytest.raises(ValueError):
+        archive.WorkoutArchive(path)
@@ -0,0 +1,160 @@
+import pytest
+
+import batch
+import homework
+
+
+PACKAGES = {
+    'SWM': [[720, 1, 80, 25, 40], [1206, 12, 6, 12, 3], [420, 4, 20, 42, 5]],
+    'RUN': [[15000, 1, 75], [420, 4, 20], [1206, 12, 6]],
+    'WLK': [[9000, 1, 75, 180], [3000.33, 2.512, 75.8, 180.1]],
+}
+
+
+def to_columns(workout_type, rows):
+    names = homework.SPECS[workout_type].field_names
+    return {name: [row[i] for row in rows] for i, name in enumerate(names)}
+
+
+@pytest.mark.parametrize('workout_type', list(PACKAGES))
+def test_compute_batch_matches_training(workout_type):
+    rows = PACKAGES[workout_type]
+    result = batch.compute_batch(workout_type, to_columns(workout_type, rows))
+    expected = [
+        homework.read_package(workout_type, row).show_training_info()
+        for row in rows
+    ]
+    assert list(result.iter_info()) == expected, (
+        'Пакетный расчёт должен совпадать с расчётом по объектам.'
+    )
+
+
+def test_compute_batch_missing_column():
+    with pytest.raises(KeyError):
+        batch.compute_batch('RUN', {'action': [1], 'duration': [1]})
+
+
+def test_compute_batch_unequal_columns():
+    with pytest.raises(ValueError):
+        batch.compute_batch(
+            'RUN', {'action': [1, 2], 'duration': [1], 'weight': [1]}
+        )
+
+
+@pytest.mark.parametrize('workout_type', list(PACKAGES))
+def test_training_batch_rows(workout_type):
+    rows = PACKAGES[workout_type]
+    training_batch = batch.TrainingBatch.from_rows(workout_type, rows)
+    assert len(training_batch) == len(rows)
+    assert training_batch.nbytes == len(rows) * sum(
+        column.itemsize for column in training_batch.columns.values()
+    ), 'Хранилище должно занимать только байты значений полей.'
+    assert list(training_batch) == [
+        homework.read_package(workout_type, row) for row in rows
+    ]
+    assert list(training_batch.compute().iter_info()) == [
+        training.show_training_info() for training in training_batch
+    ]
+
+
+def test_training_batch_integer_columns():
+    training_batch = batch.TrainingBatch.from_rows('SWM', PACKAGES['SWM'])
+    assert training_batch.columns['action'].typecode == 'q'
+    assert training_batch.columns['count_pool'].typecode == 'q'
+    assert training_batch.columns['duration'].typecode == 'd'
+    assert type(training_batch[0].action) is int, (
+        'Целые поля должны храниться и возвращаться как целые.'
+    )
+    walking = batch.TrainingBatch.from_rows('WLK', PACKAGES['WLK'])
+    assert walking.columns['action'].typecode == 'd', (
+        'Дробные значения целого поля должны храниться как double.'
+    )
+    running = batch.TrainingBatch('RUN')
+    running.append([15000, 1, 75])
+    running.append([3000.5, 1, 75])
+    assert running.columns['action'].tolist() == [15000, 3000.5]
+
+
+def test_training_batch_wrong_len():
+    training_batch = batch.TrainingBatch('RUN')
+    with pytest.raises(TypeError):
+        training_batch.append([1, 2])
+
+
+def test_process_parallel_keeps_order():
+    packages = [
+        (workout_type, row)
+        for workout_type, rows in PACKAGES.items()
+        for row in rows
+    ] * 3
+    result = list(
+        batch.process_parallel(packages, workers=2, chunk_size=4)
+    )
+    expected = [
+        homework.read_package(*package).show_training_info()
+        for package in packages
+    ]
+    assert result == expected, (
+        'Параллельный расчёт должен сохранять порядок пакетов.'
+    )
+
+
+def test_compute_batch_unknown_type():
+    with pytest.raises(TypeError):
+        batch.compute_batch('XXX', {})
+
+
+def test_compute_checked_routes_rejected_rows():
+    rows = [
+        [9000, 1, 75, 180],
+        [9000, 0, 75, 180],
+        [9000, 1, 75, 0],
+        [420, 4, 60, 170],
+        [9000, 1, 1000, 180],
+    ]
+    checked = batch.TrainingBatch.from_rows('WLK', rows).compute_checked()
+    assert list(checked.accepted) == [0, 3]
+    assert list(checked.rejected_indexes) == [1, 2, 4]
+    assert checked.reasons == ['duration', 'height', 'weight'], (
+        'Отказ должен содержать поле, не прошедшее проверку.'
+    )
+    assert list(checked.rejected) == [
+        homework.read_package('WLK', rows[index]) for index in (1, 2, 4)
+    ], 'Недопустимые строки должны откладываться без изменений.'
+    assert list(checked.result.iter_info()) == [
+        homework.read_package('WLK', rows[index]).show_training_info()
+        for index in (0, 3)
+    ]
+
+
+def test_check_columns_skips_other_fields():
+    columns = {
+        'action': [720, 720], 'duration': [1, float('nan')],
+        'weight': [80, 80], 'length_pool': [25, 0], 'count_pool': [40, 40],
+    }
+    assert list(batch.check_columns('SWM', columns)) == [0, 1]
+    assert len(batch.compute_checked('RUN', {
+        'action': [15000], 'duration': [1], 'weight': [75]
+    }).result) == 1
+
+
+def test_bulk_paths_report_rejected_rows():
+    packages = [
+        ('RUN', [15000, 1, 75]),
+        ('RUN', [15000, 0, 75]),
+        ('WLK', [9000, 1, 75, 180]),
+    ]
+    results, rejected = batch.compute_packages(packages)
+    assert results[1] is None
+    assert rejected == [(1, 'duration')], (
+        'Пакет с нулевой длительностью должен попадать в отказы.'
+    )
+    reported = []
+    messages = list(batch.process_parallel(
+        packages * 2, workers=2, chunk_size=2,
+        on_reject=lambda index, reason: reported.append((index, reason))
+    ))
+    assert len(messages) == 4
+    assert reported == [(1, 'duration'), (4, 'duration')], (
+        'Номер отказа должен считаться от начала потока пакетов.'
+    )
@@ -0,0 +1,115 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import cache
+import homework
+from conftest import Capturing
+
+
+def test_hits_and_evictions():
+    results = cache.ResultCache(max_entries=2)
+    first = results.get_info('RUN', [15000, 1, 75])
+    assert results.get_info('RUN', (15000, 1, 75)) is first, (
+        'Повторный пакет должен возвращать сохранённый результат.'
+    )
+    results.get_info('WLK', [9000, 1, 75, 180])
+    results.get_info('SWM', [720, 1, 80, 25, 40])
+    assert results.stats() == {
+        'entries': 2,
+        'max_entries': 2,
+        'hits': 1,
+        'misses': 3,
+        'evictions': 1,
+    }
+    assert results.get_info('RUN', [15000, 1, 75]) is not first, (
+        'Давно не использованная запись должна вытесняться.'
+    )
+
+
+def test_result_matches_read_package():
+    assert cache.ResultCache().get_info('WLK', [9000, 1, 75, 180]) == (
+        homework.read_package('WLK', [9000, 1, 75, 180]).show_training_info()
+    )
+
+
+def test_errors_are_not_cached():
+    results = cache.ResultCache()
+    with pytest.raises(TypeError):
+        results.get_info('RUN', [1, 2])
+    assert len(results) == 0
+
+
+def test_threads():
+    results = cache.ResultCache(max_entries=10)
+    packages = [('RUN', [1000 + index % 20, 1, 75]) for index in range(400)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        infos = list(executor.map(lambda p: results.get_info(*p), packages))
+    stats = results.stats()
+    assert stats['hits'] + stats['misses'] == len(packages)
+    assert stats['entries'] <= 10
+    assert infos[0] == homework.read_package(*packages[0]).show_training_info()
+
+
+def test_fingerprint_is_stable():
+    assert cache.fingerprint('RUN', [15000, 1, 75]) == (
+        cache.fingerprint('RUN', (15000.0, 1.0, 75.0))
+    ), 'Отпечаток не должен зависеть от типа чисел.'
+    assert cache.fingerprint('RUN', [15000, 1, 75], 1) != (
+        cache.fingerprint('RUN', [15000, 1, 75], 2)
+    ), 'Отпечаток должен учитывать версию формул.'
+
+
+def test_persistent_survives_reopen(tmp_path):
+    path = tmp_path / 'cache.sqlite'
+    expected = homework.read_package(
+        'SWM', [720, 1, 80, 25, 40]
+    ).show_training_info()
+    with cache.PersistentResultCache(path) as results:
+        assert results.get_info('SWM', [720, 1, 80, 25, 40]) == expected
+    with cache.PersistentResultCache(path) as results:
+        assert results.get_info('SWM', [720, 1, 80, 25, 40]) == expected
+        assert results.stats() == {
+            'entries': 1, 'max_entries': cache.DISK_MAX_ENTRIES,
+            'hits': 1, 'misses': 0,
+        }, 'Результат должен сохраняться между запусками.'
+
+
+def test_persistent_evicts_oldest(tmp_path):
+    with cache.PersistentResultCache(
+        tmp_path / 'cache.sqlite', max_entries=2
+    ) as results:
+        for action in (1000, 2000, 3000):
+            results.get_info('RUN', [action, 1, 75])
+        assert len(results) == 2
+        results.get_info('RUN', [3000, 1, 75])
+        results.get_info('RUN', [1000, 1, 75])
+        assert (results.hits, results.misses) == (1, 4), (
+            'Вытесняться должна самая старая запись.'
+        )
+
+
+def test_persistent_drops_other_versions(tmp_path, monkeypatch):
+    path = tmp_path / 'cache.sqlite'
+    with cache.PersistentResultCache(path) as results:
+        results.get_info('RUN', [15000, 1, 75])
+    monkeypatch.setattr(cache, 'FORMULA_VERSION', cache.FORMULA_VERSION + 1)
+    with cache.PersistentResultCache(path) as results:
+        assert len(results) == 0, (
+            'Результаты прежней версии формул не должны использоваться.'
+        )
+
+
+def test_cli_cache(tmp_path):
+    packages = tmp_path / 'packages.ndjson'
+    packages.write_text('["RUN", [15000, 1, 75]]\n', encoding='utf-8')
+    path = tmp_path / 'cache.sqlite'
+    for _ in range(2):
+        with Capturing() as output:
+            homework.cli([str(packages), '--cache', str(path)])
+        assert output == [
+            homework.read_package('RUN', [15000, 1, 75])
+            .show_training_info().get_message()
+        ]
+    with cache.PersistentResultCache(path) as results:
+        assert len(results) == 1
@@ -0,0 +1,79 @@
+import pytest
+
+import dedup
+
+
+class Clock:
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_duplicates_are_suppressed():
+    packages = [
+        ('RUN', [15000, 1, 75]),
+        ('WLK', [9000, 1, 75, 180]),
+        ('RUN', [15000.0, 1.0, 75.0]),
+        ('RUN', [15000, 1, 76]),
+    ]
+    deduplicator = dedup.Deduplicator(window=100)
+    assert list(deduplicator.iter_unique(packages)) == [
+        packages[0], packages[1], packages[3]
+    ], 'Повтор пакета должен отсеиваться.'
+    assert deduplicator.stats()['seen'] == 4
+    assert deduplicator.stats()['suppressed'] == 1
+
+
+def test_window_rotation_by_count():
+    deduplicator = dedup.Deduplicator(window=2)
+    assert deduplicator.add('RUN', [1, 1, 75])
+    assert deduplicator.add('RUN', [2, 1, 75])
+    assert deduplicator.add('RUN', [3, 1, 75])
+    assert not deduplicator.add('RUN', [1, 1, 75]), (
+        'Пакет предыдущего окна должен считаться повтором.'
+    )
+    assert deduplicator.add('RUN', [4, 1, 75])
+    assert deduplicator.add('RUN', [5, 1, 75])
+    assert deduplicator.add('RUN', [1, 1, 75]), (
+        'Пакет позапрошлого окна должен забываться.'
+    )
+    assert deduplicator.rotations == 2
+
+
+def test_window_rotation_by_time():
+    clock = Clock()
+    deduplicator = dedup.Deduplicator(period=60, clock=clock)
+    assert deduplicator.add('RUN', [1, 1, 75])
+    clock.now = 61
+    assert not deduplicator.add('RUN', [1, 1, 75])
+    clock.now = 122
+    assert deduplicator.add('RUN', [1, 1, 75])
+    assert not deduplicator.add('RUN', [1, 1, 75])
+    clock.now = 10_122
+    assert deduplicator.add('RUN', [1, 1, 75]), (
+        'После долгого простоя пакет не должен считаться повтором.'
+    )
+
+
+def test_memory_is_fixed_and_error_rate_holds():
+    deduplicator = dedup.Deduplicator(window=1000, error_rate=0.01)
+    nbytes = deduplicator.nbytes
+    for action in range(10_000):
+        deduplicator.add('RUN', [action, 1, 75])
+    assert deduplicator.nbytes == nbytes, (
+        'Память фильтра не должна расти с количеством пакетов.'
+    )
+    assert deduplicator.suppressed <= 10_000 * 0.01, (
+        'Доля ложных повторов не должна превышать заданную.'
+    )
+
+
+@pytest.mark.parametrize('params', [
+    {'window': 0},
+    {'error_rate': 0},
+    {'error_rate': 1},
+])
+def test_wrong_params(params):
+    with pytest.raises(ValueError):
+        dedup.Deduplicator(**params)
@@ -2,7 +2,13 @@ import re
 import pytest
 import types
 import inspect
+import subprocess
+import sys
 from collections import namedtuple
+from dataclasses import dataclass, fields
+from io import StringIO
+from itertools import islice
+from pathlib import Path
 from conftest import Capturing
 
 try:
@@ -224,6 +230,16 @@ def test_Training_show_training_info(monkeypatch):
     )
 
 
+def test_show_training_info_uses_instance_overrides(monkeypatch):
+    running = homework.Running(15000, 1, 75)
+    monkeypatch.setattr(running, 'get_mean_speed', lambda: 5.0)
+    monkeypatch.setattr(running, 'get_spent_calories', lambda: 100)
+    info = running.show_training_info()
+    assert (info.speed, info.calories) == (5.0, 100), (
+        'Методы, подменённые на объекте, должны попадать в сообщение.'
+    )
+
+
 def test_Swimming():
     assert hasattr(homework, 'Swimming'), 'Создайте класс `Swimming`'
     assert inspect.isclass(homework.Swimming), (
@@ -451,3 +467,439 @@ def test_main_output(input_data, expected):
     assert get_message_output == expected, (
         'Метод `main` должен печатать результат в консоль.\n'
     )
+
+
+def test_iter_messages_stream():
+    def feed():
+        while True:
+            yield 'RUN', [15000, 1, 75]
+            yield 'WLK', [9000, 1, 75, 180]
+
+    messages = homework.iter_messages(
+        homework.iter_trainings(homework.iter_packages(feed()))
+    )
+    result = [message.get_message() for message in islice(messages, 4)]
+    assert result[1] == result[3] == (
+        'Тип тренировки: SportsWalking; '
+        'Длительность: 1.000 ч.; '
+        'Дистанция: 5.850 км; '
+        'Ср. скорость: 5.850 км/ч; '
+        'Потрачено ккал: 349.252.'
+    ), 'Конвейер должен обрабатывать бесконечный поток пакетов.'
+
+
+@pytest.mark.parametrize('size, expected', [
+    (2, [[0, 1], [2, 3], [4]]),
+    (5, [[0, 1, 2, 3, 4]]),
+    (10, [[0, 1, 2, 3, 4]]),
+])
+def test_iter_chunks(size, expected):
+    assert list(homework.iter_chunks(range(5), size)) == expected
+
+
+def test_iter_chunks_wrong_size():
+    with pytest.raises(ValueError):
+        list(homework.iter_chunks(range(5), 0))
+
+
+def test_read_packages_bulk():
+    rows = [[9000, 1, 75, 180], [420, 4, 20, 42]]
+    result = homework.read_packages_bulk('WLK', rows)
+    assert result == [homework.read_package('WLK', row) for row in rows], (
+        'Функция `read_packages_bulk` должна создавать те же объекты, '
+        'что и `read_package`.'
+    )
+
+
+@pytest.mark.parametrize('input_data', [
+    ('XXX', [[9000, 1, 75]]),
+    ('RUN', [[9000, 1, 75], [9000, 1]]),
+])
+def test_read_packages_bulk_errors(input_data):
+    with pytest.raises(TypeError):
+        homework.read_packages_bulk(*input_data)
+
+
+def test_validate_packages():
+    packages = [
+        ('RUN', [15000, 1, 75]),
+        ('XXX', [1, 2, 3]),
+        ('WLK', [9000, 1, 75]),
+        ('SWM', [720, 1, 80, 25, 40]),
+    ]
+    trainings, report = homework.validate_packages(packages)
+    assert trainings == [
+        homework.read_package(*packages[0]),
+        homework.read_package(*packages[3]),
+    ], 'Функция `validate_packages` должна возвращать верные пакеты.'
+    assert list(report) == [(1, 'unknown_type'), (2, 'wrong_len')]
+    assert report.counts() == {
+        'unknown_type': 1, 'wrong_len': 1, 'malformed': 0
+    }
+    for position, package in enumerate((packages[1], packages[2])):
+        with pytest.raises(TypeError) as error:
+            homework.read_package(*package)
+        assert report.message(position) == str(error.value), (
+            'Текст отказа должен совпадать с текстом ошибки `read_package`.'
+        )
+
+
+@pytest.mark.parametrize('package', [
+    ('RUN', None),
+    ('RUN',),
+    None,
+    (['RUN'], [15000, 1, 75]),
+])
+def test_validate_packages_malformed(package):
+    trainings, report = homework.validate_packages(
+        [package, ('RUN', [15000, 1, 75])]
+    )
+    assert len(trainings) == 1, (
+        'Пакет не того вида не должен прерывать проверку.'
+    )
+    assert list(report) == [(0, 'malformed')]
+    assert report.message(0) == homework.ERROR_PACKAGE_MESSAGE
+
+
+def test_validate_packages_compact():
+    trainings, report = homework.validate_packages(
+        [('RUN', [15000, 1, 75])], compact=True
+    )
+    assert type(trainings[0]) is homework.SPECS['RUN'].compact_class
+    assert not report
+
+
+def test_register_training():
+    spec = homework.SPECS['SWM']
+    assert spec.training_class is homework.Swimming
+    assert spec.arity == 5
+    assert spec.field_names == (
+        'action', 'duration', 'weight', 'length_pool', 'count_pool'
+    )
+
+
+@pytest.mark.parametrize('input_data', [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+])
+def test_compact_classes(input_data):
+    workout_type, data = input_data
+    training = homework.read_package(workout_type, data)
+    compact, = homework.read_packages_bulk(workout_type, [data], compact=True)
+    assert not hasattr(compact, '__dict__'), (
+        'Объекты компактных классов не должны хранить `__dict__`.'
+    )
+    assert (
+        compact.show_training_info() == training.show_training_info()
+    ), 'Компактный класс должен считать так же, как исходный.'
+
+
+@pytest.mark.parametrize('workout_type', ['SWM', 'RUN', 'WLK'])
+def test_compact_classes_type_checks(workout_type):
+    spec = homework.SPECS[workout_type]
+    compact = spec.compact_class
+    assert issubclass(compact, homework.Training)
+    assert issubclass(compact, spec.training_class), (
+        'Компактный класс должен проходить проверки исходного класса.'
+    )
+    assert not any(
+        issubclass(compact, other.training_class)
+        for other in homework.SPECS.values() if other is not spec
+    )
+    assert compact.__name__ == spec.training_class.__name__
+    assert compact.__qualname__ != spec.training_class.__qualname__
+
+
+def test_show_training_info_after_mutation():
+    running = homework.Running(9000, 1, 75)
+    assert len(fields(running)) == 3, (
+        'У тренировки не должно быть служебных полей.'
+    )
+    running.duration = 2
+    assert running.get_mean_speed() == 2.925, (
+        'Расчёт должен учитывать изменённые поля.'
+    )
+    assert running.show_training_info() == homework.InfoMessage(
+        'Running', 2, running.get_distance(), running.get_mean_speed(),
+        running.get_spent_calories()
+    ), 'Сообщение должно совпадать с расчётом отдельных методов.'
+
+
+INFO_MESSAGES = [
+    homework.InfoMessage('Swimming', 1, 0.9936, 1.0, 336.0),
+    homework.InfoMessage('Running', 1.5, 9.75, 6.5, 797.805),
+    homework.InfoMessage('SportsWalking', 2.512, 1.95, 0.776, 408.4291),
+]
+
+
+def test_format_messages():
+    expected = ''.join(
+        info.get_message() + '\n' for info in INFO_MESSAGES
+    )
+    assert homework.format_messages(INFO_MESSAGES) == expected, (
+        'Пакетный вывод должен совпадать с `get_message`.'
+    )
+
+
+def test_positional_template_prefix_names():
+    @dataclass
+    class Lap:
+        time: float
+        time_total: float
+        MESSAGE = '{time_total:.1f} {{всего}} / {time!r} / {time.real}'
+
+    lap = Lap(1.5, 4.25)
+    assert homework.message_formatter(Lap)(lap) == Lap.MESSAGE.format(
+        time=lap.time, time_total=lap.time_total
+    ), 'Имя поля, начинающееся с имени другого поля, не должно ломаться.'
+
+
+def test_write_messages():
+    output = StringIO()
+    count = homework.write_messages(INFO_MESSAGES, output, chunk_size=2)
+    assert count == len(INFO_MESSAGES)
+    assert output.getvalue() == homework.format_messages(INFO_MESSAGES)
+
+
+@pytest.fixture
+def cycling():
+    @dataclass
+    class Cycling(homework.Training):
+        LEN_STEP = 5.2
+        CALORIES_MULTIPLIER = 0.6
+
+        cadence: float
+
+        def get_spent_calories(self, speed: float = None) -> float:
+            return self.CALORIES_MULTIPLIER * self.weight * self.get_distance()
+
+    homework.register_training('CYC', Cycling)
+    yield Cycling
+    del homework.CLASSES['CYC'], homework.SPECS['CYC']
+
+
+def test_register_training_kernel(cycling):
+    training = homework.read_package('CYC', [3000, 1, 70, 80])
+    assert training.get_distance() == 3000 * 5.2 / 1000
+    kernel = homework.SPECS['CYC'].batch_kernel
+    assert kernel.__code__.co_filename == '<batch kernel Cycling>', (
+        'Для нового типа должен собираться расчёт по колонкам.'
+    )
+    columns = kernel([3000], [1], [70], [80])
+    assert [column[0] for column in columns] == [
+        training.get_distance(),
+        training.get_mean_speed(),
+        training.get_spent_calories(),
+    ], 'Пакетный расчёт должен совпадать с расчётом по объекту.'
+
+
+def test_kernel_keeps_constant_sign():
+    @dataclass
+    class Shifted(homework.Training):
+        SHIFT = -2
+
+        def get_spent_calories(self, speed: float = None) -> float:
+            return self.SHIFT ** 2 * self.weight
+
+    homework.register_training('SHF', Shifted)
+    try:
+        *_, calories = homework.SPECS['SHF'].batch_kernel([100], [1], [80])
+        assert list(calories) == [320.0], (
+            'Подстановка константы не должна менять порядок операций.'
+        )
+    finally:
+        del homework.CLASSES['SHF'], homework.SPECS['SHF']
+
+
+def test_kernel_field_named_like_local():
+    @dataclass
+    class Treadmill(homework.Training):
+        speed: float
+
+        def get_spent_calories(self, speed: float = None) -> float:
+            return self.speed * self.weight
+
+    homework.register_training('TRM', Treadmill)
+    try:
+        training = Treadmill(15000, 1, 80, 3)
+        *_, calories = homework.SPECS['TRM'].batch_kernel(
+            [15000], [1], [80], [3]
+        )
+        assert list(calories) == [training.get_spent_calories()] == [240], (
+            'Поле с именем показателя не должно подменяться в расчёте.'
+        )
+    finally:
+        del homework.CLASSES['TRM'], homework.SPECS['TRM']
+
+
+def test_unsupported_method_uses_objects():
+    @dataclass
+    class Rowing(homework.Training):
+        def get_spent_calories(self, speed: float = None) -> float:
+            return max(self.weight, 100) * 2.0
+
+    homework.register_training('ROW', Rowing)
+    try:
+        assert Rowing(100, 1, 80).get_spent_calories() == 200.0
+        *_, calories = homework.SPECS['ROW'].batch_kernel([100], [1], [80])
+        assert list(calories) == [200.0]
+    finally:
+        del homework.CLASSES['ROW'], homework.SPECS['ROW']
+
+
+def test_cli_reads_file(tmp_path):
+    path = tmp_path / 'packages.ndjson'
+    path.write_text(
+        '["RUN", [15000, 1, 75]]\n\n["WLK", [9000, 1, 75, 180]]\n',
+        encoding='utf-8'
+    )
+    with Capturing() as output:
+        assert homework.cli([str(path)]) == 0
+    assert output == [
+        homework.read_package('RUN', [15000, 1, 75])
+        .show_training_info().get_message(),
+        homework.read_package('WLK', [9000, 1, 75, 180])
+        .show_training_info().get_message(),
+    ], 'Команда должна выводить сообщения по пакетам из файла.'
+
+
+def test_cli_demo():
+    with Capturing() as output:
+        homework.cli([])
+    assert len(output) == len(homework.DEMO_PACKAGES)
+
+
+def test_script_runs_homework_once(tmp_path):
+    path = tmp_path / 'packages.csv'
+    path.write_text('RUN,15000,1,75\n', encoding='utf-8')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', 'homework.py', str(path)],
+        cwd=Path(homework.__file__).parent,
+        capture_output=True, text=True, check=True
+    )
+    assert result.stdout == homework.read_package(
+        'RUN', [15000, 1, 75]
+    ).show_training_info().get_message() + '\n'
+    imports = [
+        line for line in result.stderr.splitlines()
+        if line.split('|')[-1].strip() == 'homework'
+    ]
+    assert not imports, (
+        'Запуск скрипта не должен выполнять модуль `homework` повторно.'
+    )
+
+
+def test_import_is_minimal():
+    code = (
+        'import sys, homework; '
+        'print(sorted({"argparse", "asyncio", "batch", "json", "kernels",'
+        ' "sqlite3"}'
+        ' & set(sys.modules)))'
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=Path(homework.__file__).parent,
+        capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == '[]', (
+        'Импорт `homework` не должен загружать необязательные модули.'
+    )
+
+
+class CountingFile(StringIO):
+    writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def test_buffered_sink():
+    output = CountingFile()
+    with homework.BufferedSink(output, buffer_size=2) as sink:
+        for info in INFO_MESSAGES:
+            sink.write(info.get_message())
+    assert output.writes == 2, (
+        'Буферизованный приёмник должен писать по нескольку сообщений.'
+    )
+    assert output.getvalue() == homework.format_messages(INFO_MESSAGES)
+
+
+def test_main_sink():
+    sink = homework.ListSink()
+    with Capturing() as output:
+        homework.main(homework.read_package('RUN', [15000, 1, 75]), sink)
+    assert output == []
+    assert sink.messages == [
+        homework.read_package('RUN', [15000, 1, 75])
+        .show_training_info().get_message()
+    ]
+
+
+def test_write_messages_to_sinks():
+    expected = [info.get_message() for info in INFO_MESSAGES]
+    received = []
+    list_sink = homework.ListSink()
+    for sink in (
+        list_sink, homework.CallbackSink(received.append), homework.NullSink()
+    ):
+        count = homework.write_messages(INFO_MESSAGES, sink, chunk_size=2)
+        assert count == len(INFO_MESSAGES)
+    assert list_sink.messages == received == expected, (
+        'Сообщения должны попадать в приёмник в исходном порядке.'
+    )
+
+
+def test_sink_requires_write_many():
+    class Incomplete(homework.Sink):
+        def write(self, message):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_cli_rejects_workers_with_cache(tmp_path):
+    with pytest.raises(SystemExit):
+        homework.cli([
+            'packages.ndjson', '--workers', '2',
+            '--cache', str(tmp_path / 'cache.sqlite'),
+        ])
+
+
+def test_class_added_to_classes_is_registered():
+    @dataclass
+    class Skating(homework.Training):
+        def get_spent_calories(self, speed: float = None) -> float:
+            return 10.0
+
+    homework.CLASSES['SKT'] = Skating
+    try:
+        assert homework.read_package('SKT', [100, 1, 80]) == Skating(
+            100, 1, 80
+        ), 'Класс, добавленный в `CLASSES`, должен читаться по коду.'
+        assert homework.SPECS['SKT'].arity == 3
+    finally:
+        del homework.CLASSES['SKT']
+        homework.SPECS.pop('SKT', None)
+
+
+def test_compact_class_supports_super():
+    @dataclass
+    class Interval(homework.Running):
+        def get_spent_calories(self, speed: float = None) -> float:
+            return super().get_spent_calories(speed) * 2
+
+    homework.register_training('INT', Interval)
+    try:
+        compact, = homework.read_packages_bulk(
+            'INT', [[15000, 1, 75]], compact=True
+        )
+        assert compact.show_training_info() == homework.read_package(
+            'INT', [15000, 1, 75]
+        ).show_training_info(), (
+            'Методы с `super()` должны работать в компактном классе.'
+        )
+    finally:
+        del homework.CLASSES['INT'], homework.SPECS['INT']
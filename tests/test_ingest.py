@@ -0,0 +1,59 @@
+from io import StringIO
+
+import pytest
+
+import homework
+import ingest
+
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+    ('RUN', [1206, 12, 6]),
+]
+EXPECTED = homework.format_messages(
+    homework.read_package(*package).show_training_info()
+    for package in PACKAGES
+)
+CSV = ''.join(
+    ','.join([workout_type, *map(str, data)]) + '\n'
+    for workout_type, data in PACKAGES
+)
+NDJSON = ''.join(
+    f'["{workout_type}", {data}]\n' for workout_type, data in PACKAGES
+)
+
+
+@pytest.mark.parametrize('fmt, text', [('csv', CSV), ('ndjson', NDJSON)])
+def test_ingest(fmt, text):
+    output = StringIO()
+    count = ingest.ingest(StringIO(text), output, fmt, hint=40)
+    assert count == len(PACKAGES)
+    assert output.getvalue() == EXPECTED, (
+        'Массовая обработка должна выводить сообщения в порядке пакетов.'
+    )
+
+
+def test_cli_csv(tmp_path):
+    path = tmp_path / 'packages.csv'
+    path.write_text(CSV, encoding='utf-8')
+    output = StringIO()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr('sys.stdout', output)
+        homework.cli([str(path)])
+    assert output.getvalue() == EXPECTED
+
+
+def test_ingest_reports_rejected_rows():
+    output = StringIO()
+    reported = []
+    count = ingest.ingest(
+        StringIO('RUN,15000,0,75\n' + CSV), output, 'csv',
+        on_reject=lambda index, reason: reported.append((index, reason))
+    )
+    assert count == len(PACKAGES)
+    assert reported == [(0, 'duration')], (
+        'Недопустимая строка должна отвергаться, а не прерывать обработку.'
+    )
+    assert output.getvalue() == EXPECTED
@@ -0,0 +1,38 @@
+import pytest
+
+import homework
+import instrumentation
+
+
+@pytest.fixture
+def recorder():
+    recorder = instrumentation.Recorder()
+    instrumentation.enable(recorder)
+    yield recorder
+    instrumentation.disable()
+
+
+def test_stage_counters(recorder):
+    for package in [('RUN', [15000, 1, 75]), ('WLK', [9000, 1, 75, 180])]:
+        homework.main(homework.read_package(*package))
+    snapshot = recorder.snapshot()
+    assert set(snapshot) == {
+        'read_package', 'get_spent_calories', 'get_message'
+    }, 'Замеры должны собираться по каждому этапу.'
+    assert snapshot['get_spent_calories']['WLK']['count'] == 1
+    assert sum(snapshot['get_message']['RUN']['buckets'].values()) == 1
+    assert 'training_stage_seconds_count{stage="read_package",' \
+        'workout_type="RUN"} 1' in recorder.to_prometheus()
+
+
+def test_disable_restores_functions():
+    read_package = homework.read_package
+    get_message = homework.InfoMessage.get_message
+    get_spent_calories = homework.Running.get_spent_calories
+    instrumentation.enable(instrumentation.Recorder())
+    assert instrumentation.is_enabled()
+    instrumentation.disable()
+    assert not instrumentation.is_enabled()
+    assert homework.read_package is read_package
+    assert homework.InfoMessage.get_message is get_message
+    assert homework.Running.get_spent_calories is get_spent_calories
@@ -0,0 +1,48 @@
+import pytest
+
+import homework
+import live
+
+
+@pytest.mark.parametrize('workout_type, params, ticks, expected', [
+    ('RUN', {'weight': 75}, [{'action': 5000, 'duration': 0.25}] * 3,
+     [15000, 0.75, 75]),
+    ('WLK', {'weight': 75, 'height': 180},
+     [{'action': 3000, 'duration': 0.5}] * 3, [9000, 1.5, 75, 180]),
+    ('SWM', {'weight': 80, 'length_pool': 25},
+     [{'action': 240, 'duration': 0.5, 'count_pool': 20}] * 2,
+     [480, 1.0, 80, 25, 40]),
+])
+def test_live_session_matches_training(workout_type, params, ticks, expected):
+    session = live.LiveSession(workout_type, **params)
+    for tick in ticks:
+        session.update(**tick)
+    assert session.show_training_info() == homework.read_package(
+        workout_type, expected
+    ).show_training_info(), (
+        'Показатели текущей тренировки должны совпадать с расчётом '
+        'законченной тренировки.'
+    )
+
+
+def test_live_session_before_first_tick():
+    session = live.LiveSession('RUN', weight=75)
+    session.update(action=100)
+    info = session.show_training_info()
+    assert info.speed == info.calories == 0.0
+    assert info.distance == 0.065
+
+
+@pytest.mark.parametrize('workout_type, params, tick', [
+    ('RUN', {'weight': 75}, {'count_pool': 1}),
+    ('RUN', {'weight': 75}, {'weight': 1}),
+])
+def test_live_session_wrong_delta(workout_type, params, tick):
+    session = live.LiveSession(workout_type, **params)
+    with pytest.raises(TypeError):
+        session.update(**tick)
+
+
+def test_live_session_wrong_param():
+    with pytest.raises(TypeError):
+        live.LiveSession('RUN', weight=75, action=10)
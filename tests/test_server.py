@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+import pytest
+
+import server
+
+
+PACKAGES = [
+    ['SWM', [720, 1, 80, 25, 40]],
+    ['RUN', [15000, 1, 75]],
+    ['WLK', [9000, 1, 75, 180]],
+    ['XXX', [1, 2, 3]],
+    ['RUN', [1, 2]],
+    ['RUN', ['1', 2, 3]],
+]
+
+
+async def exchange(tmp_path, use_unix):
+    if use_unix:
+        path = str(tmp_path / 'server.sock')
+        srv = await server.start_server(path=path)
+        address = {'path': path}
+    else:
+        srv = await server.start_server(host='127.0.0.1', port=0)
+        address = {
+            'host': '127.0.0.1',
+            'port': srv.sockets[0].getsockname()[1],
+        }
+    async with srv:
+        return await server.send_packages(PACKAGES, **address)
+
+
+@pytest.mark.parametrize('use_unix', [False, True])
+def test_server_responses(tmp_path, use_unix):
+    responses = asyncio.run(exchange(tmp_path, use_unix))
+    assert len(responses) == len(PACKAGES)
+    assert responses[0]['message'] == (
+        'Тип тренировки: Swimming; '
+        'Длительность: 1.000 ч.; '
+        'Дистанция: 0.994 км; '
+        'Ср. скорость: 1.000 км/ч; '
+        'Потрачено ккал: 336.000.'
+    ), 'Сервер должен возвращать сообщение о тренировке.'
+    assert responses[2]['training_type'] == 'SportsWalking'
+    assert all('error' in response for response in responses[3:]), (
+        'Сервер должен сообщать об ошибочных пакетах.'
+    )
+
+
+def test_process_line_invalid_json():
+    assert b'error' in server.process_line(b'{not json')
+
+
+@pytest.mark.parametrize('line', [
+    b'["WLK", [1e200, 1, 75, 180]]',
+    b'["RUN", [' + b'9' * 400 + b', 1, 75]]',
+    b'["RUN", [NaN, 1, 75]]',
+    b'["RUN", [1e400, 1, 75]]',
+    b'["RUN", [15000, 0, 75]]',
+])
+def test_process_line_rejects_non_finite(line):
+    response = json.loads(server.process_line(line))
+    assert 'error' in response, (
+        'Сервер должен отвечать ошибкой на значения вне диапазона чисел.'
+    )
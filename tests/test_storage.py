@@ -0,0 +1,89 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import homework
+import storage
+
+
+RECORDS = [
+    ('anna', 100.0, 'RUN', [15000, 1, 75]),
+    ('ivan', 150.0, 'SWM', [720, 1, 80, 25, 40]),
+    ('anna', 200.0, 'WLK', [9000, 1, 75, 180]),
+    ('anna', 300.0, 'RUN', [1206, 12, 6]),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    with storage.TrainingStore(tmp_path / 'trainings.db') as store:
+        store.add_packages(RECORDS, batch_size=3)
+        yield store
+
+
+def expected_info(record):
+    return homework.read_package(*record[2:]).show_training_info()
+
+
+def test_query_cached_results(store):
+    result = store.query(user_id='anna', since=150)
+    assert [item.recorded_at for item in result] == [200.0, 300.0]
+    assert [item.info for item in result] == [
+        expected_info(record) for record in RECORDS[2:]
+    ], 'Сохранённые результаты должны совпадать с расчётом.'
+
+
+def test_query_recompute(store):
+    result = store.query(workout_type='RUN', recompute=True)
+    assert [item.info for item in result] == [
+        expected_info(RECORDS[0]), expected_info(RECORDS[3])
+    ]
+
+
+def test_stale_results_are_recomputed(store, monkeypatch):
+    store.add_packages([('petr', 400.0, 'RUN', [420, 4, 20])], compute=False)
+    monkeypatch.setattr(storage, 'FORMULA_VERSION', 2)
+    assert store.compute_results() == len(RECORDS) + 1, (
+        'После смены версии формул результаты нужно пересчитать.'
+    )
+    assert store.compute_results() == 0
+    assert store.query(user_id='petr')[0].info == expected_info(
+        ('petr', 400.0, 'RUN', [420, 4, 20])
+    )
+
+
+def test_query_recomputes_only_filtered_rows(store, monkeypatch):
+    store.add_packages([('petr', 400.0, 'RUN', [420, 4, 20])], compute=False)
+    monkeypatch.setattr(storage, 'FORMULA_VERSION', 2)
+    assert len(store.query(user_id='petr')) == 1
+    assert store.compute_results(user_id='petr') == 0
+    assert store.compute_results() == len(RECORDS), (
+        'Запрос должен досчитывать только выбранные пакеты.'
+    )
+    statements = []
+    store.connection.set_trace_callback(statements.append)
+    store.query(user_id='anna')
+    assert not any(
+        statement.startswith(('BEGIN', 'INSERT'))
+        for statement in statements
+    ), 'Чтение без устаревших результатов не должно открывать запись.'
+
+
+def test_concurrent_writers(tmp_path):
+    path = tmp_path / 'trainings.db'
+    storage.TrainingStore(path).close()
+
+    def write(user_id):
+        with storage.TrainingStore(path) as store:
+            return store.add_packages(
+                [(user_id, float(index), 'RUN', [15000, 1, 75])
+                 for index in range(200)],
+                batch_size=10
+            )
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        counts = list(executor.map(write, ['a', 'b', 'c', 'd']))
+    with storage.TrainingStore(path) as store:
+        assert len(store.query()) == sum(counts) == 800, (
+            'Параллельные записи не должны терять пакеты.'
+        )
@@ -0,0 +1,60 @@
+import pytest
+
+import homework
+import wire
+
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('RUN', [420, 4, 20]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+    ('SWM', [1206, 12, 6, 12, 3]),
+]
+
+
+def test_round_trip():
+    frames = wire.decode_packages(wire.encode_packages(PACKAGES))
+    assert [frame.workout_type for frame in frames] == [
+        'SWM', 'RUN', 'WLK', 'SWM'
+    ], 'Подряд идущие пакеты одного типа должны попадать в один кадр.'
+    trainings = [training for frame in frames for training in frame]
+    assert trainings == [
+        homework.read_package(*package) for package in PACKAGES
+    ]
+
+
+def test_columns_are_views():
+    buffer = wire.encode_packages(PACKAGES[1:3])
+    frame, = wire.decode_packages(buffer)
+    assert isinstance(frame.columns['action'], memoryview), (
+        'Колонки должны ссылаться на исходный буфер без копирования.'
+    )
+    assert list(frame.columns['weight']) == [75, 20]
+    assert list(frame.compute().iter_info()) == [
+        homework.read_package(*package).show_training_info()
+        for package in PACKAGES[1:3]
+    ]
+
+
+@pytest.mark.parametrize('cut', [3, 12])
+def test_truncated_buffer(cut):
+    buffer = wire.encode_packages(PACKAGES[:1])
+    with pytest.raises(ValueError):
+        wire.decode_packages(buffer[:cut])
+
+
+def test_unknown_type():
+    with pytest.raises(TypeError):
+        wire.encode_packages([('XXX', [1, 2, 3])])
+
+
+@pytest.mark.parametrize('code', ['CYCL', 'CY', 'ВЕЛ'])
+def test_code_must_fit_header(code):
+    homework.register_training(code, homework.Running)
+    try:
+        with pytest.raises(ValueError):
+            wire.encode_frame(code, [[15000, 1, 75]])
+    finally:
+        del homework.CLASSES[code], homework.SPECS[code]
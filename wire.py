@@ -0,0 +1,110 @@
+"""Двоичный формат пакетов от датчиков.
+
+Поток состоит из кадров. Кадр - заголовок `FRAME_HEADER` с кодом
+тренировки и количеством записей, за которым идут записи
+фиксированной ширины: значения полей типа по порядку, каждое -
+число double в порядке байтов little-endian.
+"""
+import struct
+import sys
+from array import array
+from itertools import groupby
+
+from batch import TrainingBatch
+from homework import get_spec, wrong_len_error
+
+FRAME_HEADER = struct.Struct('<3sxI')
+LITTLE_ENDIAN = sys.byteorder == 'little'
+
+CODE_SIZE = 3
+
+ERROR_CODE_MESSAGE = (
+    'Код тренировки {workout_type!r} нельзя записать в кадр: '
+    'нужно ровно {size} символа ASCII'
+)
+ERROR_TRUNCATED_MESSAGE = (
+    'Кадр {workout_type} обрезан: ожидалось {needed} байт, '
+    'получено {given}'
+)
+
+
+def encode_frame(workout_type: str, rows) -> bytes:
+    """Закодировать строки данных одного типа в кадр."""
+    spec = get_spec(workout_type)
+    if len(workout_type) != CODE_SIZE or not workout_type.isascii():
+        raise ValueError(ERROR_CODE_MESSAGE.format(
+            workout_type=workout_type, size=CODE_SIZE
+        ))
+    values = array('d')
+    count = 0
+    for data in rows:
+        if len(data) != spec.arity:
+            raise wrong_len_error(len(data), spec.arity)
+        values.extend(data)
+        count += 1
+    if not LITTLE_ENDIAN:
+        values.byteswap()
+    return (
+        FRAME_HEADER.pack(workout_type.encode('ascii'), count)
+        + values.tobytes()
+    )
+
+
+def encode_packages(packages) -> bytes:
+    """Закодировать пакеты `(workout_type, data)` с сохранением порядка.
+
+    Подряд идущие пакеты одного типа попадают в один кадр.
+    """
+    return b''.join(
+        encode_frame(workout_type, (data for _, data in group))
+        for workout_type, group in groupby(packages, key=lambda p: p[0])
+    )
+
+
+def frame_values(buffer, offset: int, workout_type: str, size: int):
+    """Значения кадра как memoryview из double без копирования."""
+    # Длина проверяется до создания memoryview: иначе при ошибке
+    # экспортированный буфер остаётся в трассировке и mmap не закрыть.
+    given = max(0, min(size, len(buffer) - offset))
+    if given != size:
+        raise ValueError(
+            ERROR_TRUNCATED_MESSAGE.format(
+                workout_type=workout_type, needed=size, given=given
+            )
+        )
+    body = memoryview(buffer)[offset:offset + size]
+    if LITTLE_ENDIAN:
+        return body.cast('B').cast('d')
+    values = array('d', body.tobytes())
+    values.byteswap()
+    return memoryview(values)
+
+
+def iter_frames(buffer):
+    """Получать кадры потока как колоночные `TrainingBatch`.
+
+    Колонки - срезы memoryview над исходным буфером, поэтому
+    записи не превращаются в списки Python, а буфер нельзя менять,
+    пока с колонками работают.
+    """
+    view = memoryview(buffer)
+    offset = 0
+    while offset < len(view):
+        if len(view) - offset < FRAME_HEADER.size:
+            raise ValueError('Заголовок кадра обрезан')
+        code, count = FRAME_HEADER.unpack_from(view, offset)
+        workout_type = code.decode('ascii')
+        spec = get_spec(workout_type)
+        offset += FRAME_HEADER.size
+        size = count * spec.arity * 8
+        values = frame_values(view, offset, workout_type, size)
+        offset += size
+        yield TrainingBatch(workout_type, {
+            name: values[index::spec.arity]
+            for index, name in enumerate(spec.field_names)
+        })
+
+
+def decode_packages(buffer) -> list[TrainingBatch]:
+    """Разобрать весь поток на кадры."""
+    return list(iter_frames(buffer))